@@ -1,15 +1,15 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from utils.file_handler import SecureFileHandler
+from utils import SecureFileHandler
 from utils.data_processor import DataProcessor
-from utils.chatbot import ExcelChatbot
-from utils.visualizations import ChartGenerator
-from config.security import SecurityConfig
+from utils.security import SecurityConfig
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-Write: shallow copies share data until a column is modified (always on from pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 # Page configuration
 st.set_page_config(
     page_title="Excel Data Analysis & Chatbot",
@@ -21,6 +21,19 @@ st.set_page_config(
 # Security initialization
 security = SecurityConfig()
 
+# Number of chat messages rendered outside the "earlier messages" expander
+CHAT_HISTORY_VISIBLE = 20
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _describe_numeric(df_key: str, _numeric_data: pd.DataFrame) -> pd.DataFrame:
+    """Descriptive statistics, cached per uploaded file so reruns skip recomputation"""
+    return DataProcessor().get_statistics(_numeric_data)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _correlate_numeric(df_key: str, _numeric_data: pd.DataFrame) -> pd.DataFrame:
+    """Correlation matrix, cached per uploaded file so reruns skip recomputation"""
+    return DataProcessor().compute_correlation(_numeric_data)
+
 def main():
     st.title("🔒 Secure Excel Data Analysis & AI Chatbot")
     st.markdown("Upload Excel files securely and chat with your data using AI")
@@ -28,10 +41,14 @@ def main():
     # Initialize session state
     if 'data' not in st.session_state:
         st.session_state.data = None
+    if 'data_preview' not in st.session_state:
+        st.session_state.data_preview = None
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
     if 'processed_data' not in st.session_state:
         st.session_state.processed_data = None
+    if 'file_hash' not in st.session_state:
+        st.session_state.file_hash = None
     
     # Sidebar for file upload and controls
     with st.sidebar:
@@ -49,29 +66,59 @@ def main():
             help="Upload Excel files up to 50MB"
         )
         
+        st.checkbox(
+            "🛡️ Deep security scan",
+            key="deep_scan",
+            help="Scan every row of large sheets for suspicious content instead of a 50,000-row sample"
+        )
+        
         if uploaded_file:
-            with st.spinner("🔍 Validating and processing file..."):
-                validation_result = file_handler.validate_and_process(uploaded_file)
-                
-                if validation_result['success']:
-                    st.session_state.data = validation_result['data']
-                    st.session_state.processed_data = validation_result['processed_data']
-                    st.success(f"✅ File loaded successfully!")
-                    st.info(f"📊 {len(validation_result['data'])} rows × {len(validation_result['data'].columns)} columns")
+            # Only re-process when the upload content changes; reruns reuse session data
+            file_hash = SecureFileHandler.generate_file_hash(uploaded_file)
+            
+            if file_hash != st.session_state.file_hash:
+                with st.spinner("🔍 Validating and processing file..."):
+                    validation_result = file_handler.validate_and_preview(
+                        uploaded_file, file_hash, deep_scan=st.session_state.deep_scan
+                    )
+                    
+                    if validation_result['success']:
+                        st.session_state.data_preview = validation_result['data']
+                        st.session_state.processed_data = validation_result['processed_data']
+                        # Small workbooks are already complete; larger ones load in full on demand
+                        st.session_state.data = None if validation_result['is_preview'] else validation_result['data']
+                        st.session_state.file_hash = file_hash
+                    else:
+                        st.error(f"❌ {validation_result['message']}")
+                        st.session_state.data = None
+                        st.session_state.data_preview = None
+                        st.session_state.file_hash = None
+            
+            if st.session_state.file_hash == file_hash:
+                st.success(f"✅ File loaded successfully!")
+                if st.session_state.data is not None:
+                    st.info(f"📊 {len(st.session_state.data)} rows × {len(st.session_state.data.columns)} columns")
                 else:
-                    st.error(f"❌ {validation_result['message']}")
-                    st.session_state.data = None
+                    st.info(f"📊 Previewing first {len(st.session_state.data_preview)} rows × "
+                            f"{len(st.session_state.data_preview.columns)} columns")
         
         # Clear data button
         if st.button("🗑️ Clear All Data", type="secondary"):
+            from utils.visualisation import clear_caches
+            
+            # Cached uploads, chart frames and figures live in process memory, not session state
+            st.cache_data.clear()
+            clear_caches()
             st.session_state.data = None
+            st.session_state.data_preview = None
             st.session_state.chat_history = []
             st.session_state.processed_data = None
+            st.session_state.file_hash = None
             st.success("Data cleared successfully!")
-            st.experimental_rerun()
+            st.rerun()
     
     # Main content area
-    if st.session_state.data is not None:
+    if st.session_state.data_preview is not None:
         # Create tabs for different functionalities
         tab1, tab2, tab3, tab4 = st.tabs(["📊 Data Overview", "📈 Visualizations", "🤖 AI Chat", "🔧 Advanced Analysis"])
         
@@ -81,15 +128,15 @@ def main():
         
         # Tab 2: Visualizations
         with tab2:
-            show_visualizations()
+            show_visualizations(uploaded_file)
         
         # Tab 3: AI Chatbot
         with tab3:
-            show_chatbot()
+            show_chatbot(uploaded_file)
         
         # Tab 4: Advanced Analysis
         with tab4:
-            show_advanced_analysis()
+            show_advanced_analysis(uploaded_file)
             
     else:
         # Welcome screen when no data is loaded
@@ -113,38 +160,79 @@ def main():
         **👈 Start by uploading an Excel file using the sidebar**
         """)
 
+def ensure_full_dataset(uploaded_file, key: str) -> bool:
+    """Offer to load the complete workbook when only a preview is in session"""
+    if st.session_state.data is not None:
+        return True
+    
+    st.info(f"👀 Only the first {len(st.session_state.data_preview)} rows are loaded for preview. "
+            "Load the full dataset to use this section.")
+    
+    if uploaded_file is None:
+        st.warning("Upload the file again to load the full dataset.")
+        return False
+    
+    if st.button("📥 Load full dataset", key=key):
+        with st.spinner("📥 Loading full dataset..."):
+            result = SecureFileHandler().load_full(
+                uploaded_file, st.session_state.file_hash, deep_scan=st.session_state.deep_scan
+            )
+        
+        if result['success']:
+            st.session_state.data = result['data']
+            st.session_state.processed_data = result['processed_data']
+            st.rerun()
+        else:
+            st.error(f"❌ {result['message']}")
+    
+    return False
+
 def show_data_overview():
     """Display data overview and basic statistics"""
-    if st.session_state.data is not None:
+    if st.session_state.data_preview is not None:
         data_processor = DataProcessor()
+        # Full dataset once loaded, otherwise the preview rows
+        is_preview = st.session_state.data is None
+        data = st.session_state.data_preview if is_preview else st.session_state.data
         
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.subheader("📋 Data Preview")
-            st.dataframe(st.session_state.data.head(100), use_container_width=True)
+            st.dataframe(data.head(100), use_container_width=True)
         
         with col2:
             st.subheader("📊 Data Summary")
-            summary = data_processor.get_data_summary(st.session_state.data)
+            summary = data_processor.get_data_summary(data)
             
-            st.metric("Total Rows", summary['total_rows'])
-            st.metric("Total Columns", summary['total_columns'])
-            st.metric("Missing Values", summary['missing_values'])
+            if is_preview:
+                # Row-based figures only cover the preview until the full workbook is loaded
+                st.caption(f"Preview figures: first {summary['total_rows']:,} rows only. "
+                           "Load the full dataset for totals.")
+                st.metric("Rows (preview)", summary['total_rows'])
+                st.metric("Total Columns", summary['total_columns'])
+                st.metric("Missing Values (preview)", summary['missing_values'])
+            else:
+                st.metric("Total Rows", summary['total_rows'])
+                st.metric("Total Columns", summary['total_columns'])
+                st.metric("Missing Values", summary['missing_values'])
             
             # Show column types
             st.subheader("📝 Column Information")
             col_info = pd.DataFrame({
-                'Column': st.session_state.data.columns,
-                'Type': st.session_state.data.dtypes,
-                'Non-Null': st.session_state.data.count()
+                'Column': data.columns,
+                'Type': data.dtypes,
+                'Non-Null (preview)' if is_preview else 'Non-Null': st.session_state.processed_data['notna_counts']
             })
             st.dataframe(col_info, use_container_width=True)
 
-def show_visualizations():
+def show_visualizations(uploaded_file):
     """Display interactive visualizations"""
-    if st.session_state.data is not None:
-        chart_generator = ChartGenerator()
+    if ensure_full_dataset(uploaded_file, key="load_full_visualizations"):
+        # Deferred import: Plotly is only loaded once a chart is requested
+        from utils.visualisation import ChartGenerator
+        
+        chart_generator = ChartGenerator(data_key=st.session_state.file_hash)
         
         st.subheader("📈 Interactive Visualizations")
         
@@ -154,8 +242,8 @@ def show_visualizations():
             ["Bar Chart", "Line Chart", "Scatter Plot", "Histogram", "Box Plot", "Heatmap"]
         )
         
-        numeric_columns = st.session_state.data.select_dtypes(include=['number']).columns.tolist()
-        categorical_columns = st.session_state.data.select_dtypes(include=['object']).columns.tolist()
+        numeric_columns = st.session_state.processed_data['numeric_columns']
+        categorical_columns = st.session_state.processed_data['categorical_columns']
         
         if chart_type == "Bar Chart":
             chart_generator.create_bar_chart(st.session_state.data, categorical_columns, numeric_columns)
@@ -170,17 +258,30 @@ def show_visualizations():
         elif chart_type == "Heatmap":
             chart_generator.create_heatmap(st.session_state.data, numeric_columns)
 
-def show_chatbot():
+def show_chatbot(uploaded_file):
     """Display the AI chatbot interface"""
-    if st.session_state.data is not None:
+    # The chat context describes the whole dataset, so it is only built from the full workbook
+    if ensure_full_dataset(uploaded_file, key="load_full_chat") and st.session_state.processed_data is not None:
         st.subheader("🤖 Chat with Your Data")
         
         # Initialize chatbot
         try:
+            # Deferred import: the OpenAI client is only loaded when the chat tab renders
+            from utils.chatbot import ExcelChatbot, ChatbotError, batched
+            
             chatbot = ExcelChatbot()
             
-            # Chat interface
-            for message in st.session_state.chat_history:
+            # Chat interface: only the most recent messages render on every rerun
+            older = st.session_state.chat_history[:-CHAT_HISTORY_VISIBLE]
+            recent = st.session_state.chat_history[-CHAT_HISTORY_VISIBLE:]
+            
+            if older:
+                with st.expander(f"Earlier messages ({len(older)})"):
+                    for message in older:
+                        with st.chat_message(message["role"]):
+                            st.write(message["content"])
+            
+            for message in recent:
                 with st.chat_message(message["role"]):
                     st.write(message["content"])
             
@@ -195,22 +296,34 @@ def show_chatbot():
                 # Generate AI response
                 with st.chat_message("assistant"):
                     with st.spinner("🤔 Analyzing your data..."):
+                        placeholder = st.empty()
                         try:
-                            response = chatbot.get_response(prompt, st.session_state.processed_data)
-                            st.write(response)
+                            # Stream tokens as they arrive, batched so each rerender carries ~30ms of text
+                            parts = []
+                            for text in batched(chatbot.stream_response(prompt, st.session_state.processed_data)):
+                                parts.append(text)
+                                placeholder.markdown("".join(parts) + "▌")
+                            
+                            # Formatting runs once on the complete text
+                            response = chatbot.finalize_response("".join(parts))
+                            placeholder.markdown(response)
                             st.session_state.chat_history.append({"role": "assistant", "content": response})
+                        except ChatbotError as e:
+                            # The error replaces any partial answer already streamed
+                            placeholder.markdown(str(e))
+                            st.session_state.chat_history.append({"role": "assistant", "content": str(e)})
                         except Exception as e:
                             error_msg = "I apologize, but I encountered an error processing your question. Please try rephrasing it."
-                            st.write(error_msg)
+                            placeholder.write(error_msg)
                             st.session_state.chat_history.append({"role": "assistant", "content": error_msg})
         
         except Exception as e:
             st.error("Chatbot service is currently unavailable. Please check your OpenAI API configuration.")
             st.info("💡 To enable the chatbot, add your OpenAI API key to the Streamlit secrets.")
 
-def show_advanced_analysis():
+def show_advanced_analysis(uploaded_file):
     """Display advanced analytical features"""
-    if st.session_state.data is not None:
+    if ensure_full_dataset(uploaded_file, key="load_full_advanced"):
         data_processor = DataProcessor()
         
         st.subheader("🔧 Advanced Data Analysis")
@@ -220,9 +333,10 @@ def show_advanced_analysis():
         
         with col1:
             st.subheader("📊 Descriptive Statistics")
-            numeric_data = st.session_state.data.select_dtypes(include=['number'])
-            if not numeric_data.empty:
-                st.dataframe(numeric_data.describe(), use_container_width=True)
+            numeric_columns = st.session_state.processed_data['numeric_columns']
+            numeric_data = st.session_state.data[numeric_columns]
+            if numeric_columns:
+                st.dataframe(_describe_numeric(st.session_state.file_hash, numeric_data), use_container_width=True)
             else:
                 st.info("No numeric columns found for statistical analysis")
         
@@ -234,9 +348,11 @@ def show_advanced_analysis():
                 st.metric(metric.replace('_', ' ').title(), value)
         
         # Correlation analysis
-        if not numeric_data.empty and len(numeric_data.columns) > 1:
+        if len(numeric_columns) > 1:
+            import plotly.express as px
+            
             st.subheader("🔗 Correlation Analysis")
-            correlation_matrix = numeric_data.corr()
+            correlation_matrix = _correlate_numeric(st.session_state.file_hash, numeric_data)
             
             fig = px.imshow(correlation_matrix, 
                           text_auto=True, 
@@ -247,4 +363,3 @@ def show_advanced_analysis():
 
 if __name__ == "__main__":
     main()
-```
@@ -0,0 +1,31 @@
+import os
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+@pytest.fixture
+def app():
+    return AppTest.from_file(APP_PATH, default_timeout=30)
+
+def test_app_compiles():
+    """app.py is valid Python on its own"""
+    with open(APP_PATH) as source:
+        compile(source.read(), APP_PATH, 'exec')
+
+def test_landing_page_renders(app):
+    """The app imports its modules and renders the landing page without raising"""
+    app.run()
+    assert not app.exception
+    assert not app.error
+    assert [button.label for button in app.button] == ['🗑️ Clear All Data']
+
+def test_clear_all_data_clears_chart_caches(app, monkeypatch):
+    """The sidebar's clear button also drops chart caches held in process memory"""
+    from utils import visualisation
+    cleared = []
+    monkeypatch.setattr(visualisation, 'clear_caches', lambda: cleared.append(True))
+    app.run()
+    app.button[0].click().run()
+    assert not app.exception
+    assert cleared == [True]
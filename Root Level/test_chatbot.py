@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+import pytest
+from utils.chatbot import ChatbotError, ExcelChatbot
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+def stream(*texts, error=None):
+    """Stand-in for a streamed completion, optionally failing after the given chunks"""
+    for text in texts:
+        yield chunk(text)
+    if error is not None:
+        raise error
+
+@pytest.fixture
+def chatbot(monkeypatch):
+    """Chatbot with a configured key whose API client replays a scripted stream"""
+    monkeypatch.setattr(ExcelChatbot, '_get_api_key', lambda self: 'sk-test')
+    bot = ExcelChatbot()
+    bot.script = stream()
+    bot._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **kwargs: bot.script)))
+    return bot
+
+def test_response_is_formatted(chatbot):
+    """A complete answer gets the usual formatting"""
+    chatbot.script = stream('The data has ', '3 columns.')
+    assert chatbot.get_response('How many columns?', {}) == '💡 The data has 3 columns.'
+
+def test_error_is_returned_unformatted(chatbot):
+    """Errors are shown as-is, without the answer prefix or the partial answer"""
+    chatbot.script = stream('The data has ', error=RuntimeError('connection reset'))
+    response = chatbot.get_response('How many columns?', {})
+    assert response == chatbot._error_message(RuntimeError())
+    assert response.startswith('❌') and 'The data has' not in response
+
+def test_stream_raises_mid_stream(chatbot):
+    """A failure after some chunks surfaces as ChatbotError, so callers can replace the partial text"""
+    chatbot.script = stream('The data ', 'has ', error=RuntimeError('connection reset'))
+    received = []
+    with pytest.raises(ChatbotError) as excinfo:
+        for text in chatbot.stream_response('How many columns?', {}):
+            received.append(text)
+    assert received == ['The data ', 'has ']
+    assert str(excinfo.value) == chatbot._error_message(RuntimeError())
+
+def test_missing_key_message_is_not_formatted(monkeypatch):
+    """Without a key the setup instructions are returned unchanged"""
+    monkeypatch.setattr(ExcelChatbot, '_get_api_key', lambda self: None)
+    assert ExcelChatbot().get_response('Hi', {}).startswith('🔑 **OpenAI API Key Required**')
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_processor import DataProcessor
+
+@pytest.fixture
+def processor():
+    return DataProcessor()
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(1)
+    n = 200
+    units = rng.integers(0, 100, n)
+    return pd.DataFrame({
+        'units': units,
+        'price': rng.normal(20, 5, n),
+        'revenue': units * 2.5,
+        'discount': np.tile([0.1, 0.25], n // 2),
+        'region': np.tile(['north', 'south', 'east', 'west'], n // 4),
+        'order_id': [f'A{i:04d}' for i in range(n)],
+    })
+
+def test_correlation_matches_pandas(processor, sales):
+    """The float32 matrix product agrees with DataFrame.corr()"""
+    numeric = sales[['units', 'price', 'revenue', 'discount']]
+    pd.testing.assert_frame_equal(processor.compute_correlation(numeric), numeric.corr(),
+                                  check_dtype=False, atol=1e-5)
+
+def test_correlation_with_missing_values_uses_pairwise_pandas(processor, sales):
+    """Missing values keep pandas' pairwise deletion"""
+    numeric = sales[['units', 'price', 'revenue']].astype(np.float64)
+    numeric.iloc[::7, 1] = np.nan
+    pd.testing.assert_frame_equal(processor.compute_correlation(numeric), numeric.corr())
+
+def test_correlation_constant_column_is_nan(processor):
+    """A constant column has no defined correlation"""
+    df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [5.0, 5.0, 5.0]})
+    corr = processor.compute_correlation(df)
+    assert corr.loc['a', 'a'] == pytest.approx(1.0)
+    assert np.isnan(corr.loc['a', 'b']) and np.isnan(corr.loc['b', 'b'])
+
+def test_correlation_large_offsets(processor):
+    """Columns far from zero keep their precision (float32 alone cannot hold 1e8 + 0.01)"""
+    rng = np.random.default_rng(5)
+    n = 1_000
+    df = pd.DataFrame({
+        'timestamp': 1e8 + 0.01 * np.arange(n),
+        'index': np.arange(n, dtype=np.float64),
+        'reading': 1e8 + rng.normal(size=n),
+        'noise': rng.normal(size=n),
+    })
+    corr = processor.compute_correlation(df)
+    assert corr.loc['timestamp', 'index'] == pytest.approx(1.0, abs=1e-5)
+    pd.testing.assert_frame_equal(corr, df.corr(), check_dtype=False, atol=1e-5)
+
+def test_statistics_match_describe(processor, sales):
+    """get_statistics keeps describe()'s layout and values"""
+    numeric = sales.select_dtypes(include=['number'])
+    pd.testing.assert_frame_equal(processor.get_statistics(sales), numeric.describe(), check_dtype=False)
+
+def test_optimize_dtypes_downcasts_without_changing_values(processor, sales):
+    """Numeric columns shrink only when every value survives; the caller's frame is untouched"""
+    original = sales.copy()
+    optimized = processor.optimize_dtypes(sales)
+
+    assert optimized['units'].dtype == np.int8
+    assert optimized['revenue'].dtype == np.float32      # multiples of 0.5 are exact in float32
+    assert optimized['price'].dtype == np.float64        # arbitrary doubles would be rounded
+    assert optimized['discount'].dtype == np.float64     # 0.1 has no exact float32 form
+    pd.testing.assert_frame_equal(optimized, original, check_dtype=False, check_categorical=False)
+    pd.testing.assert_frame_equal(sales, original)
+
+def test_optimize_dtypes_categories_by_cardinality(processor, sales):
+    """Repetitive text becomes categorical, identifier-like text does not"""
+    optimized = processor.optimize_dtypes(sales)
+    assert isinstance(optimized['region'].dtype, pd.CategoricalDtype)
+    assert not isinstance(optimized['order_id'].dtype, pd.CategoricalDtype)
+
+def test_optimize_dtypes_empty_frame(processor):
+    """An empty frame comes back unchanged"""
+    df = pd.DataFrame({'name': pd.Series([], dtype=object)})
+    pd.testing.assert_frame_equal(processor.optimize_dtypes(df), df)
+
+def test_clean_data_fills_category_columns(processor):
+    """Categorical gaps take the mode, or a new 'Unknown' category when there is no mode"""
+    df = pd.DataFrame({
+        'region': pd.Series(['north', None, 'north', 'south'], dtype='category'),
+        'segment': pd.Series([None, None, None, None], dtype='category'),
+        'channel': pd.Series(['web', None, 'web', 'shop'], dtype=object),
+        'units': [1.0, np.nan, 3.0, 5.0],
+    })
+    original = df.copy()
+    options = {'remove_duplicates': False, 'fill_numeric_missing': True, 'fill_categorical_missing': True}
+    cleaned = processor.clean_data(df, options)
+
+    assert cleaned['region'].tolist() == ['north', 'north', 'north', 'south']
+    assert cleaned['segment'].tolist() == ['Unknown'] * 4
+    assert cleaned['channel'].tolist() == ['web', 'web', 'web', 'shop']
+    assert cleaned['units'].tolist() == [1.0, 3.0, 3.0, 5.0]
+    assert isinstance(cleaned['region'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(df, original)
+
+def test_clean_data_after_optimize_dtypes(processor, sales):
+    """Frames shrunk at ingest can be cleaned with every option enabled"""
+    sales.loc[::9, 'region'] = None
+    optimized = processor.optimize_dtypes(sales)
+    options = {'remove_duplicates': True, 'fill_numeric_missing': True, 'fill_categorical_missing': True}
+    assert not processor.clean_data(optimized, options)['region'].isna().any()
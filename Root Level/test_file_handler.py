@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import pandas as pd
+from utils import SecureFileHandler
+
+OVERSIZED = 'x' * 10_001
+
+@pytest.fixture
+def handler():
+    return SecureFileHandler()
+
+@pytest.mark.parametrize('dtype', [object, 'string', 'string[pyarrow]', 'category'])
+def test_oversized_cell_names_its_column(handler, dtype):
+    """The column holding an oversized cell is reported, whatever its string dtype"""
+    df = pd.DataFrame({'name': ['ok', 'fine', None], 'notes': ['short', None, OVERSIZED]}).astype(dtype)
+    result = handler._security_scan(df)
+    assert not result['safe']
+    assert result['message'] == 'Cell content in column "notes" exceeds size limit'
+
+def test_unused_category_is_not_measured(handler):
+    """Only categories that occur in the column count towards the size limit"""
+    column = pd.Series(['ok', 'fine']).astype('category').cat.add_categories([OVERSIZED])
+    assert handler._security_scan(pd.DataFrame({'notes': column}))['safe']
+
+def test_mixed_object_column(handler):
+    """Non-string cells are measured by their string form"""
+    df = pd.DataFrame({'notes': ['ok', 12, None, 3.5]})
+    assert handler._security_scan(df)['safe']
+    df.at[1, 'notes'] = ['x'] * 3_000
+    assert handler._security_scan(df)['message'] == 'Cell content in column "notes" exceeds size limit'
+
+def sample_columns():
+    """Columns whose distinct values appear early, late (past the prefix) or not at all"""
+    rng = np.random.default_rng(6)
+    n = 2_000
+    late = np.zeros(n)
+    late[1_500:1_504] = [1, 2, 3, 4]
+    strings = pd.Series(rng.choice(['north', 'south', None], n), dtype=object)
+    return {
+        'floats': pd.Series(np.where(rng.random(n) < 0.2, np.nan, rng.normal(size=n))),
+        'late_uniques': pd.Series(late),
+        'strings': strings,
+        'arrow_strings': strings.astype('string[pyarrow]'),
+        'categories': strings.astype('category'),
+        'nullable_ints': pd.Series(pd.array(rng.integers(0, 9, n), dtype='Int64')),
+        'dates': pd.Series(pd.date_range('2024-01-01', periods=n, freq='h')).dt.floor('D'),
+        'all_missing': pd.Series([None] * n, dtype=object),
+        'empty': pd.Series([], dtype=object),
+    }
+
+@pytest.mark.parametrize('name', list(sample_columns()))
+def test_first_unique_values_match_pandas(name):
+    """Sample values equal the first five distinct values pandas finds, with the same scalar types"""
+    column = sample_columns()[name]
+    expected = column.dropna().drop_duplicates().head(5).tolist()
+    result = SecureFileHandler._first_unique_values(column)
+    assert result == expected
+    assert [type(value) for value in result] == [type(value) for value in expected]
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import _numeric_stats
+from utils._numeric_stats import STAT_NAMES, DESCRIBE_NAMES, column_stats, strong_pairs
+
+@pytest.fixture
+def numeric_frame():
+    """Numeric columns with gaps, outliers, a constant, an all-NaN and a single-value column"""
+    rng = np.random.default_rng(0)
+    spread = rng.normal(50, 10, 500)
+    spread[[3, 70, 200]] = [500, -400, np.nan]
+    return pd.DataFrame({
+        'spread': spread,
+        'ints': rng.integers(0, 100, 500),
+        'constant': np.full(500, 7.0),
+        'empty': np.full(500, np.nan),
+        'single': [1.5] + [np.nan] * 499,
+    })
+
+def expected_stats(df):
+    """Reference table from describe() plus a per-column IQR outlier count"""
+    described = df.describe().T.rename(columns=DESCRIBE_NAMES)
+    iqr = described['q75'] - described['q25']
+    lower, upper = described['q25'] - 1.5 * iqr, described['q75'] + 1.5 * iqr
+    described['outliers'] = [((df[col] < lower[col]) | (df[col] > upper[col])).sum() for col in df.columns]
+    return described[list(STAT_NAMES)].astype(np.float64)
+
+def test_default_path_matches_describe(numeric_frame):
+    """Small frames take the describe() path"""
+    pd.testing.assert_frame_equal(column_stats(numeric_frame), expected_stats(numeric_frame))
+
+def test_kernel_matches_describe(numeric_frame):
+    """The parallel kernel reproduces describe(), including quartile interpolation and outliers"""
+    kernels = _numeric_stats._kernels()
+    if kernels is None:
+        pytest.skip("numba is not installed")
+    values = numeric_frame.to_numpy(dtype=np.float64, na_value=np.nan)
+    stats = pd.DataFrame(kernels.column_stats_kernel(np.asfortranarray(values)),
+                         index=numeric_frame.columns, columns=list(STAT_NAMES))
+    pd.testing.assert_frame_equal(stats, expected_stats(numeric_frame))
+
+@pytest.fixture
+def force_kernel(monkeypatch):
+    """Route every input through the numba kernels, as if it were past the size threshold"""
+    if _numeric_stats._kernels() is None:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(_numeric_stats, 'PARALLEL_MIN_CELLS', 1)
+    monkeypatch.setattr(_numeric_stats.os, 'cpu_count', lambda: 4)
+
+def test_kernel_used_above_threshold(numeric_frame, force_kernel):
+    """Frames past the cell threshold go through the kernel and give the same table"""
+    pd.testing.assert_frame_equal(column_stats(numeric_frame), expected_stats(numeric_frame))
+
+def test_small_inputs_do_not_load_numba(numeric_frame, monkeypatch):
+    """Below the threshold neither function touches numba"""
+    def fail():
+        raise AssertionError("numba kernels loaded for a small input")
+    monkeypatch.setattr(_numeric_stats, '_kernels', fail)
+    column_stats(numeric_frame)
+    strong_pairs(np.eye(300), 0.7)
+
+def test_no_columns():
+    """A frame without numeric columns gives an empty table with every statistic"""
+    stats = column_stats(pd.DataFrame(index=range(3)))
+    assert stats.empty and list(stats.columns) == list(STAT_NAMES)
+
+@pytest.mark.parametrize('use_kernel', [True, False])
+def test_strong_pairs(use_kernel, request):
+    """Only upper-triangle pairs above the threshold are returned; NaN never qualifies"""
+    if use_kernel:
+        request.getfixturevalue('force_kernel')
+    matrix = np.array([
+        [1.0, 0.9, -0.8, np.nan],
+        [0.9, 1.0, 0.1, 0.75],
+        [-0.8, 0.1, 1.0, 0.2],
+        [np.nan, 0.75, 0.2, 1.0],
+    ])
+    rows, cols, values = strong_pairs(matrix, 0.7)
+    assert list(zip(rows, cols)) == [(0, 1), (0, 2), (1, 3)]
+    np.testing.assert_allclose(values, [0.9, -0.8, 0.75])
@@ -0,0 +1,44 @@
+import pytest
+import pandas as pd
+from utils import SUSPICIOUS_PATTERNS
+from utils.pattern_scan import PatternScanner, _hyperscan_database
+
+@pytest.fixture(params=['hyperscan', 're'])
+def scanner(request, monkeypatch):
+    """Scanner over the upload patterns, once per matching engine"""
+    if request.param == 'hyperscan':
+        if _hyperscan_database(tuple(SUSPICIOUS_PATTERNS)) is None:
+            pytest.skip("hyperscan is not installed")
+    else:
+        monkeypatch.setattr(PatternScanner, '_hs_db', property(lambda self: None))
+    return PatternScanner(SUSPICIOUS_PATTERNS)
+
+def test_clean_column(scanner):
+    """Ordinary text is not flagged"""
+    assert not scanner.contains_any(pd.Series(['Alice', 'Bob', None, 'Chicago']))
+
+@pytest.mark.parametrize('cells', [
+    ['Sun Drop', 'Table lamp'],                   # DROP\s+TABLE across the boundary
+    ['Premium Select', 'Imported from Italy'],    # SELECT.*FROM across the boundary
+])
+def test_adjacent_cells_do_not_match_together(scanner, cells):
+    """Patterns must match within a single cell, never across neighbouring cells"""
+    assert scanner.first_match(pd.Series(cells, dtype='string[pyarrow]')) is None
+
+def test_reports_first_pattern_of_flagged_cell(scanner):
+    """The reported pattern is the first one (in list order) found in the first flagged cell"""
+    column = pd.Series(['fine', "x; DROP TABLE users; <script>alert(1)</script>"])
+    assert scanner.first_match(column) == r'<script[^>]*>.*?</script>'
+
+@pytest.mark.parametrize('column', [
+    pd.Series(['ok', 'javascript:alert(1)'], dtype=object),
+    pd.Series(['ok', 'JavaScript:alert(1)'], dtype='string'),
+    pd.Series(['ok', 'javascript:alert(1)', 'ok']).astype('category'),
+])
+def test_flags_string_dtypes(scanner, column):
+    """Object, string and category columns are all scanned, case-insensitively"""
+    assert scanner.first_match(column) == 'javascript:'
+
+def test_non_string_cells_are_cast(scanner):
+    """Mixed-type cells are scanned through their string form"""
+    assert not scanner.contains_any(pd.Series([1, 2.5, None, 'text']))
@@ -0,0 +1,96 @@
+import time
+import pytest
+import pandas as pd
+from utils.pattern_scan import PatternScanner, _hyperscan_database
+from utils.security import SecurityConfig
+
+MAX_CALLS = SecurityConfig().limits.MAX_API_CALLS_PER_MINUTE
+
+@pytest.fixture(scope='module')
+def security():
+    """Shared security config; tests use distinct user ids so rate limits don't interact"""
+    return SecurityConfig()
+
+def test_input_sanitization(security):
+    """Test input sanitization"""
+    malicious_input = "<script>alert('xss')</script>"
+    sanitized = security.sanitize_input(malicious_input)
+    assert '<script>' not in sanitized.lower()
+
+def test_input_sanitization_nested(security):
+    """Payloads that reassemble after one removal are still scrubbed"""
+    sanitized = security.sanitize_input("javajavascript:script:alert(1)")
+    assert 'javascript:' not in sanitized.lower()
+
+def test_input_sanitization_adversarial_is_bounded(security):
+    """Deeply nested input is truncated before scrubbing, so it cannot stall the app"""
+    start = time.perf_counter()
+    for k in (900, 30_000):  # nested within the 10KB limit, and far beyond it
+        sanitized = security.sanitize_input('java' * k + 'script:' * k)
+        assert len(sanitized) <= 10000
+        assert 'javascript:' not in sanitized.lower()
+    assert time.perf_counter() - start < 1.0
+
+def test_data_validation_safe(security):
+    """Test data validation with safe data"""
+    safe_data = pd.DataFrame({
+        'name': ['John', 'Jane', 'Bob'],
+        'age': [25, 30, 35],
+        'city': ['New York', 'Chicago', 'LA']
+    })
+
+    result = security.validate_data_content(safe_data)
+    assert result['safe']
+    assert len(result['errors']) == 0
+
+def test_data_validation_suspicious(security):
+    """Test data validation with suspicious data"""
+    suspicious_data = pd.DataFrame({
+        'name': ['John', 'Jane'],
+        'comment': ['Normal comment', '<script>alert("xss")</script>']
+    })
+
+    result = security.validate_data_content(suspicious_data)
+    assert len(result['warnings']) > 0
+
+THREAT_SCAN_COLUMNS = [
+    ['Premium Select', 'Imported from Italy'],        # SELECT\s+.*\s+FROM only across the boundary
+    ['Sun Drop', 'Table lamp'],                       # DROP\s+TABLE only across the boundary
+    ['ok', 'SELECT name FROM users'],
+    ['ok', 'x; rm -rf /', '<iframe src=x>'],
+    ['../../etc/passwd', 'ok'],
+    ['plain', 'text', None],
+]
+
+@pytest.mark.parametrize('cells', THREAT_SCAN_COLUMNS)
+def test_threat_scan_engines_agree(security, monkeypatch, cells):
+    """Hyperscan and the re fallback flag the same columns with the same pattern"""
+    if _hyperscan_database(tuple(security.suspicious_patterns)) is None:
+        pytest.skip("hyperscan is not installed")
+    column = pd.Series(cells, dtype=object)
+
+    hyperscan_result = security._threat_scanner.first_match(column)
+    monkeypatch.setattr(PatternScanner, '_hs_db', property(lambda self: None))
+    fallback_result = security._threat_scanner.first_match(column)
+
+    assert hyperscan_result == fallback_result
+
+def test_adjacent_cells_are_not_suspicious(security):
+    """Harmless neighbouring cells never combine into a threat"""
+    data = pd.DataFrame({'product': ['Premium Select', 'Imported from Italy', 'Sun Drop', 'Table lamp']})
+
+    result = security.validate_data_content(data)
+    assert result['suspicious_columns'] == []
+
+@pytest.mark.parametrize('prior_calls', [0, 1, MAX_CALLS - 1, MAX_CALLS, MAX_CALLS + 1])
+def test_api_rate_limiting(security, prior_calls):
+    """Test API rate limiting"""
+    user_id = f"rate_limit_user_{prior_calls}"
+
+    # Simulate earlier calls
+    for _ in range(prior_calls):
+        security.validate_api_usage(user_id)
+
+    # Allowed until the per-minute limit is reached
+    result = security.validate_api_usage(user_id)
+    assert result['allowed'] == (prior_calls < MAX_CALLS)
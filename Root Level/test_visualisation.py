@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import visualisation
+from utils.visualisation import (
+    ChartGenerator, _bar_aggregation, _box_statistics, _value_counts, _fast_group_agg, _fit_line, _pearson
+)
+
+@pytest.fixture
+def charts():
+    return ChartGenerator()
+
+@pytest.fixture
+def orders():
+    """Orders with missing keys and values across a handful of regions"""
+    rng = np.random.default_rng(2)
+    n = 300
+    amount = rng.normal(100, 30, n)
+    amount[::11] = np.nan
+    region = rng.choice(['north', 'south', 'east', 'west'], n).astype(object)
+    region[::13] = None
+    return pd.DataFrame({'region': region, 'amount': amount, 'units': rng.integers(1, 10, n)})
+
+@pytest.fixture(params=['polars', 'bincount', 'groupby'])
+def engine(request, monkeypatch):
+    """Runs a test once per aggregation path"""
+    if request.param == 'polars':
+        if visualisation._polars() is None:
+            pytest.skip("polars is not installed")
+    else:
+        monkeypatch.setattr(visualisation, '_polars', lambda: None)
+        monkeypatch.setattr(visualisation, 'FAST_AGG_MIN_ROWS', 0 if request.param == 'bincount' else 10 ** 9)
+    return request.param
+
+def assert_same_groups(result, expected):
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(),
+                                   check_dtype=False, check_names=False, check_index_type=False)
+
+@pytest.mark.parametrize('aggregation', ['sum', 'mean', 'count', 'max'])
+def test_bar_aggregation_matches_groupby(orders, engine, aggregation):
+    """Every path gives groupby's result, dropping missing keys"""
+    grouped = orders.groupby('region')
+    expected = grouped.size() if aggregation == 'count' else grouped['amount'].agg(aggregation)
+    assert_same_groups(_bar_aggregation(orders, 'region', 'amount', aggregation), expected)
+
+@pytest.mark.parametrize('how', ['sum', 'mean', 'count'])
+def test_fast_group_agg_matches_groupby(orders, how):
+    """The bincount path matches groupby, including NaN values and keys"""
+    grouped = orders.groupby('region')
+    expected = grouped.size() if how == 'count' else grouped['amount'].agg(how)
+    values = None if how == 'count' else orders['amount']
+    assert_same_groups(_fast_group_agg(orders['region'], values, how), expected)
+
+def test_box_statistics_matches_groupby(orders, engine):
+    """Per-category mean, median, std and count agree with pandas"""
+    expected = orders.groupby('region')['amount'].agg(['mean', 'median', 'std', 'count']).round(3)
+    pd.testing.assert_frame_equal(_box_statistics(orders, 'region', 'amount').sort_index(), expected,
+                                  check_dtype=False, check_index_type=False)
+
+def test_value_counts_matches_pandas(orders, engine):
+    """Pie chart counts skip missing categories"""
+    assert_same_groups(_value_counts(orders, 'region'), orders['region'].value_counts())
+
+def test_fit_line_matches_polyfit():
+    """The closed-form trendline agrees with np.polyfit"""
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=100)
+    y = 3 * x + 2 + rng.normal(scale=0.1, size=100)
+    np.testing.assert_allclose(_fit_line(x, y), np.polyfit(x, y, 1))
+
+def test_fit_line_degenerate_inputs():
+    """Too few points or a constant x give no line"""
+    assert _fit_line(np.array([1.0]), np.array([2.0])) is None
+    assert _fit_line(np.array([2.0, 2.0]), np.array([1.0, 3.0])) is None
+
+def test_pearson_matches_corrcoef():
+    """The scatter correlation agrees with np.corrcoef"""
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=100)
+    y = -0.5 * x + rng.normal(size=100)
+    assert _pearson(x, y) == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+def test_pearson_degenerate_inputs():
+    """Too few points or a constant input give a NaN correlation"""
+    assert np.isnan(_pearson(np.array([1.0]), np.array([2.0])))
+    assert np.isnan(_pearson(np.array([2.0, 2.0]), np.array([1.0, 3.0])))
+
+@pytest.mark.parametrize('columns', [
+    ['day', 'value', 'series'],         # y columns named like the melt defaults
+    ['value', 'sales', 'cost'],         # x column named "value"
+])
+def test_line_chart_column_names_do_not_collide(charts, columns):
+    """User columns called "value" or "series" are drawn like any other column"""
+    x_column, *y_columns = columns
+    df = pd.DataFrame({
+        x_column: [3, 1, 2],
+        y_columns[0]: [30.0, 10.0, np.nan],
+        y_columns[1]: [3.0, 1.0, 2.0],
+    })
+    fig = charts._build_line_figure(df, x_column, tuple(y_columns))
+    assert [trace.name for trace in fig.data] == y_columns
+    assert list(fig.data[0].x) == [1, 2, 3]
+    np.testing.assert_allclose(fig.data[0].y, [10.0, np.nan, 30.0])
+
+def test_clear_caches_drops_cached_results(orders):
+    """After clear_caches the chart frame, figures and aggregations are rebuilt, not served from memory"""
+    charts = ChartGenerator(data_key='orders-clear-test')
+    calls = []
+    def build(df, column):
+        calls.append(column)
+        return df[column].sum()
+
+    def use_caches():
+        charts._plot_frame(orders)
+        charts._figure(build, orders, 'amount')
+        charts._aggregate(build, orders, 'units')
+
+    use_caches()
+    use_caches()
+    assert calls == ['amount', 'units']
+    frame = charts._plot_frame(orders)
+    assert charts._plot_frame(orders) is frame
+
+    visualisation.clear_caches()
+    assert charts._plot_frame(orders) is not frame
+    use_caches()
+    assert calls == ['amount', 'units', 'amount', 'units']
@@ -1,12 +1,34 @@
-```python
 import streamlit as st
 import pandas as pd
-import openpyxl
-from openpyxl import load_workbook
-import io
+import pyarrow as pa
+import pyarrow.compute as pc
 import hashlib
 import re
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+from .pattern_scan import PatternScanner
+from .data_processor import DataProcessor
+
+# Rows loaded for the initial preview; the full workbook is loaded on demand
+PREVIEW_ROWS = 10_000
+
+# Rows sampled for the pattern scan of large sheets unless a deep scan is requested
+SCAN_SAMPLE_ROWS = 50_000
+
+# Rows checked for sample values before falling back to the whole (bounded) head of a column
+SAMPLE_PREFIX_ROWS = 256
+
+# Patterns that indicate potentially malicious cell content
+SUSPICIOUS_PATTERNS = (
+    r'<script[^>]*>.*?</script>',  # XSS attempts
+    r'javascript:',                # JavaScript injection
+    r'vbscript:',                  # VBScript injection
+    r'on\w+\s*=',                  # Event handlers
+    r'SELECT.*FROM',               # SQL injection (basic)
+    r'DROP\s+TABLE',               # SQL injection (destructive)
+    r'INSERT\s+INTO',              # SQL injection
+    r'UPDATE\s+.*SET',             # SQL injection
+    r'DELETE\s+FROM',              # SQL injection
+)
 
 class SecureFileHandler:
     """Secure file upload and processing handler with comprehensive validation"""
@@ -17,12 +39,28 @@ class SecureFileHandler:
         self.ALLOWED_MIME_TYPES = [
             'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         ]
+        # Hyperscan-backed when available, compiled re alternation otherwise
+        self._suspicious_scanner = PatternScanner(SUSPICIOUS_PATTERNS)
     
-    def validate_and_process(self, uploaded_file) -> Dict[str, Any]:
+    def validate_and_preview(self, uploaded_file, file_hash: Optional[str] = None,
+                             nrows: int = PREVIEW_ROWS, deep_scan: bool = False) -> Dict[str, Any]:
+        """
+        Validate the upload and load only the first rows of the workbook for preview
+        Returns: Dictionary with success status, data, messages and an 'is_preview' flag
         """
-        Comprehensive validation and processing of uploaded Excel files
+        return self._validate_and_load(uploaded_file, file_hash, nrows, deep_scan)
+    
+    def load_full(self, uploaded_file, file_hash: Optional[str] = None,
+                  deep_scan: bool = False) -> Dict[str, Any]:
+        """
+        Validate the upload and load the complete workbook
         Returns: Dictionary with success status, data, and messages
         """
+        return self._validate_and_load(uploaded_file, file_hash, None, deep_scan)
+    
+    def _validate_and_load(self, uploaded_file, file_hash: Optional[str], nrows: Optional[int],
+                           deep_scan: bool = False) -> Dict[str, Any]:
+        """Comprehensive validation and processing of uploaded Excel files"""
         try:
             # Step 1: Basic file validation
             validation_result = self._validate_file(uploaded_file)
@@ -34,73 +72,10 @@ class SecureFileHandler:
                     'processed_data': None
                 }
             
-            # Step 2: Content validation and loading
-            file_content = uploaded_file.read()
-            uploaded_file.seek(0)  # Reset file pointer
-            
-            # Step 3: Load and validate Excel content
-            try:
-                # Use openpyxl for initial validation
-                workbook = load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
-                worksheet_names = workbook.sheetnames
-                
-                # Load data with pandas
-                if len(worksheet_names) > 1:
-                    # Multi-sheet workbook - let user choose or load first sheet
-                    sheet_data = {}
-                    for sheet_name in worksheet_names:
-                        try:
-                            df = pd.read_excel(io.BytesIO(file_content), sheet_name=sheet_name, engine='openpyxl')
-                            if not df.empty:
-                                sheet_data[sheet_name] = df
-                        except Exception as e:
-                            continue
-                    
-                    if sheet_data:
-                        # Use the first non-empty sheet
-                        first_sheet = list(sheet_data.keys())[0]
-                        main_df = sheet_data[first_sheet]
-                        st.info(f"📊 Loaded sheet: '{first_sheet}' from {len(worksheet_names)} available sheets")
-                    else:
-                        return {
-                            'success': False,
-                            'message': 'No valid data found in any worksheet',
-                            'data': None,
-                            'processed_data': None
-                        }
-                else:
-                    # Single sheet workbook
-                    main_df = pd.read_excel(io.BytesIO(file_content), engine='openpyxl')
-                
-                workbook.close()
-                
-            except Exception as e:
-                return {
-                    'success': False,
-                    'message': f'Failed to read Excel file: {str(e)}',
-                    'data': None,
-                    'processed_data': None
-                }
-            
-            # Step 4: Data validation and cleaning
-            processed_data = self._process_data(main_df)
-            
-            # Step 5: Security scan of processed data
-            security_check = self._security_scan(main_df)
-            if not security_check['safe']:
-                return {
-                    'success': False,
-                    'message': f'Security check failed: {security_check["message"]}',
-                    'data': None,
-                    'processed_data': None
-                }
-            
-            return {
-                'success': True,
-                'message': 'File processed successfully',
-                'data': main_df,
-                'processed_data': processed_data
-            }
+            # Step 2: Load, process and scan content (cached on the content hash)
+            if file_hash is None:
+                file_hash = self.generate_file_hash(uploaded_file)
+            return _process_upload(file_hash, uploaded_file, nrows, deep_scan)
             
         except Exception as e:
             return {
@@ -165,77 +140,71 @@ class SecureFileHandler:
     
     def _process_data(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Process and analyze the loaded data"""
+        # One pass for non-null counts, shared by missing values here and the overview tab
+        notna_counts = df.notna().sum()
+        
         processed_data = {
             'columns': df.columns.tolist(),
             'data_types': df.dtypes.to_dict(),
             'shape': df.shape,
-            'missing_values': df.isnull().sum().to_dict(),
+            'notna_counts': notna_counts,
+            'missing_values': (len(df) - notna_counts).to_dict(),
             'numeric_columns': df.select_dtypes(include=['number']).columns.tolist(),
-            'categorical_columns': df.select_dtypes(include=['object', 'category']).columns.tolist(),
+            'categorical_columns': df.select_dtypes(include=['object', 'string', 'category']).columns.tolist(),
             'datetime_columns': df.select_dtypes(include=['datetime64']).columns.tolist()
         }
+        # Boolean flag for callers that only need to know whether anything is missing
+        processed_data['has_missing'] = bool((notna_counts < len(df)).any())
+        # Text-bearing columns, shared with the security scan and visualizations
+        processed_data['string_columns'] = list(processed_data['categorical_columns'])
         
-        # Generate sample values for each column (for chatbot context)
+        # Generate sample values for each column (for chatbot context); only the head is scanned
+        head = df.head(5000)
         processed_data['sample_values'] = {}
-        for col in df.columns:
+        for col in head.columns:
             try:
-                unique_vals = df[col].dropna().unique()
-                if len(unique_vals) > 0:
-                    processed_data['sample_values'][col] = unique_vals[:5].tolist()
-                else:
-                    processed_data['sample_values'][col] = []
+                processed_data['sample_values'][col] = self._first_unique_values(head[col])
             except Exception:
                 processed_data['sample_values'][col] = []
         
-        # Generate basic statistics for numeric columns
-        if processed_data['numeric_columns']:
-            try:
-                stats = df[processed_data['numeric_columns']].describe().to_dict()
-                processed_data['statistics'] = stats
-            except Exception:
-                processed_data['statistics'] = {}
+        # Descriptive statistics are computed on demand in Advanced Analysis; only record availability
+        processed_data['statistics_available'] = bool(processed_data['numeric_columns'])
         
         return processed_data
     
-    def _security_scan(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Perform security scanning on the data content"""
-        
-        # Check for suspicious patterns in string columns
-        suspicious_patterns = [
-            r'<script[^>]*>.*?</script>',  # XSS attempts
-            r'javascript:',                 # JavaScript injection
-            r'vbscript:',                  # VBScript injection
-            r'on\\w+\\s*=',                 # Event handlers
-            r'SELECT.*FROM',               # SQL injection (basic)
-            r'DROP\\s+TABLE',               # SQL injection (destructive)
-            r'INSERT\\s+INTO',              # SQL injection
-            r'UPDATE\\s+.*SET',             # SQL injection
-            r'DELETE\\s+FROM',              # SQL injection
-        ]
+    def _security_scan(self, df: pd.DataFrame, string_columns: Optional[List[str]] = None,
+                       deep: bool = False) -> Dict[str, Any]:
+        """
+        Perform security scanning on the data content
+        Large sheets are pattern-scanned on a fixed random sample of rows unless `deep` is set
+        """
         
         try:
-            string_columns = df.select_dtypes(include=['object']).columns
+            # Check for suspicious patterns in string columns
+            if string_columns is None:
+                string_columns = df.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
+            
+            scan_df = df
+            if not deep and len(df) > SCAN_SAMPLE_ROWS:
+                scan_df = df.sample(n=SCAN_SAMPLE_ROWS, random_state=0)
             
             for col in string_columns:
-                col_data = df[col].dropna().astype(str)
-                
-                for pattern in suspicious_patterns:
-                    if col_data.str.contains(pattern, case=False, regex=True, na=False).any():
-                        return {
-                            'safe': False,
-                            'message': f'Suspicious content detected in column "{col}". Please review your data.'
-                        }
+                if self._suspicious_scanner.contains_any(scan_df[col]):
+                    return {
+                        'safe': False,
+                        'message': f'Suspicious content detected in column "{col}". Please review your data.'
+                    }
             
-            # Check for excessively large cells (potential DoS)
+            # Check for excessively large cells (potential DoS) over every string cell;
+            # this stays a full pass since a single oversized cell is enough to matter
             max_cell_size = 10000  # 10KB per cell
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    cell_sizes = df[col].dropna().astype(str).str.len()
-                    if cell_sizes.max() > max_cell_size:
-                        return {
-                            'safe': False,
-                            'message': f'Cell content in column "{col}" exceeds size limit'
-                        }
+            for col in string_columns:
+                longest = self._max_cell_length(df[col])
+                if longest is not None and longest > max_cell_size:
+                    return {
+                        'safe': False,
+                        'message': f'Cell content in column "{col}" exceeds size limit'
+                    }
             
             return {'safe': True, 'message': 'Security scan passed'}
             
@@ -247,7 +216,132 @@ class SecureFileHandler:
             }
     
     @staticmethod
-    def generate_file_hash(file_content: bytes) -> str:
-        """Generate SHA-256 hash of file content for integrity checking"""
-        return hashlib.sha256(file_content).hexdigest()
-```
+    def _first_unique_values(column: pd.Series, k: int = 5) -> list:
+        """
+        First k distinct non-null values in row order
+        Stops after a short prefix when it already holds k of them; categoricals are deduplicated on their codes
+        """
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()
+            prefix = codes[:SAMPLE_PREFIX_ROWS]
+            uniques = pd.unique(prefix[prefix >= 0])
+            if len(uniques) < k and len(codes) > SAMPLE_PREFIX_ROWS:
+                uniques = pd.unique(codes[codes >= 0])
+            return column.cat.categories.take(uniques[:k]).tolist()
+        
+        uniques = pd.unique(column.iloc[:SAMPLE_PREFIX_ROWS].dropna())
+        if len(uniques) < k and len(column) > SAMPLE_PREFIX_ROWS:
+            uniques = pd.unique(column.dropna())
+        # Through a Series so values come back as the same Python/pandas scalars as Series.tolist()
+        return pd.Series(uniques[:k], dtype=column.dtype).tolist()
+    
+    @staticmethod
+    def _max_cell_length(column: pd.Series) -> Optional[int]:
+        """Character length of the longest cell, computed with Arrow kernels on the column's own Arrow data"""
+        try:
+            strings = pa.array(column.array, from_pandas=True)
+            if pa.types.is_dictionary(strings.type):
+                # Each category is measured once; only categories that occur count
+                return pc.max(pc.take(pc.utf8_length(strings.dictionary), strings.indices)).as_py()
+            return pc.max(pc.utf8_length(strings)).as_py()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Mixed-type object columns - measure the string form of each cell
+            strings = pa.array([str(cell) for cell in column], type=pa.large_string())
+            return pc.max(pc.utf8_length(strings)).as_py()
+    
+    @staticmethod
+    def generate_file_hash(file_obj) -> str:
+        """Generate SHA-256 hash of a binary file object for integrity checking, without copying it"""
+        file_obj.seek(0)
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: hashes in-memory buffers directly, otherwise streams in chunks
+            digest = hashlib.file_digest(file_obj, 'sha256')
+        else:
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: file_obj.read(1024 * 1024), b''):
+                digest.update(chunk)
+        file_obj.seek(0)
+        return digest.hexdigest()
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _process_upload(file_hash: str, _uploaded_file, nrows: Optional[int] = None,
+                    deep_scan: bool = False) -> Dict[str, Any]:
+    """
+    Load, process and security-scan an uploaded workbook (only the first `nrows` rows if given)
+    Cached on the content hash so the upload itself is never hashed or copied by Streamlit
+    Returns: Dictionary with success status, data, and messages
+    """
+    handler = SecureFileHandler()
+    
+    try:
+        # Step 1: Load and validate Excel content
+        try:
+            # Parse every sheet in a single pass with the Rust-based calamine reader;
+            # this also validates the workbook
+            # The upload is already an in-memory buffer, so read it in place
+            _uploaded_file.seek(0)
+            all_sheets = pd.read_excel(_uploaded_file, sheet_name=None, engine='calamine', nrows=nrows)
+            
+            if len(all_sheets) > 1:
+                # Multi-sheet workbook - use the first non-empty sheet
+                first_sheet = next((name for name, df in all_sheets.items() if not df.empty), None)
+                if first_sheet is not None:
+                    main_df = all_sheets[first_sheet]
+                    st.info(f"📊 Loaded sheet: '{first_sheet}' from {len(all_sheets)} available sheets")
+                else:
+                    return {
+                        'success': False,
+                        'message': 'No valid data found in any worksheet',
+                        'data': None,
+                        'processed_data': None
+                    }
+            else:
+                # Single sheet workbook
+                main_df = next(iter(all_sheets.values()))
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Failed to read Excel file: {str(e)}',
+                'data': None,
+                'processed_data': None
+            }
+        
+        # Step 2: Store text columns as Arrow-backed strings so string operations run in C++
+        text_columns = main_df.select_dtypes(include=['object', 'string']).columns
+        if len(text_columns) > 0:
+            main_df[text_columns] = main_df[text_columns].astype('string[pyarrow]')
+        
+        # Step 3: Downcast numbers and store repetitive text as categories to shrink session memory
+        main_df = DataProcessor().optimize_dtypes(main_df)
+        
+        # Step 4: Data validation and cleaning
+        processed_data = handler._process_data(main_df)
+        
+        # Step 5: Security scan of processed data
+        security_check = handler._security_scan(main_df, processed_data['string_columns'], deep=deep_scan)
+        if not security_check['safe']:
+            return {
+                'success': False,
+                'message': f'Security check failed: {security_check["message"]}',
+                'data': None,
+                'processed_data': None
+            }
+        
+        return {
+            'success': True,
+            'message': 'File processed successfully',
+            'data': main_df,
+            'processed_data': processed_data,
+            # A preview that hit the row limit may not contain the whole sheet
+            'is_preview': nrows is not None and len(main_df) >= nrows
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'Unexpected error: {str(e)}',
+            'data': None,
+            'processed_data': None
+        }
@@ -0,0 +1,70 @@
+# Imported lazily by _numeric_stats so numba only loads when a kernel is first needed
+import numpy as np
+from numba import njit, prange
+
+from ._numeric_stats import STAT_NAMES
+
+@njit(cache=True)
+def _quantile_sorted(ordered, q):
+    """Linearly interpolated quantile of sorted values (pandas' default method)"""
+    position = (ordered.shape[0] - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, ordered.shape[0] - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+@njit(parallel=True, cache=True)
+def column_stats_kernel(values):
+    """All STAT_NAMES for every column of a 2D float64 array, one column per thread"""
+    n_cols = values.shape[1]
+    out = np.full((n_cols, len(STAT_NAMES)), np.nan)
+    for j in prange(n_cols):
+        column = values[:, j]
+        ordered = np.sort(column[~np.isnan(column)])
+        n = ordered.shape[0]
+        out[j, 0] = n
+        out[j, 8] = 0
+        if n == 0:
+            continue
+
+        mean = ordered.mean()
+        out[j, 1] = mean
+        if n > 1:
+            out[j, 2] = np.sqrt(((ordered - mean) ** 2).sum() / (n - 1))
+        out[j, 3] = ordered[0]
+        out[j, 4] = ordered[n - 1]
+
+        q25 = _quantile_sorted(ordered, 0.25)
+        q75 = _quantile_sorted(ordered, 0.75)
+        out[j, 5] = q25
+        out[j, 6] = _quantile_sorted(ordered, 0.5)
+        out[j, 7] = q75
+
+        # IQR outliers; values are sorted so both tails are contiguous runs
+        iqr = q75 - q25
+        lower_bound = q25 - 1.5 * iqr
+        upper_bound = q75 + 1.5 * iqr
+        outliers = 0
+        for value in ordered:
+            if value < lower_bound or value > upper_bound:
+                outliers += 1
+        out[j, 8] = outliers
+    return out
+
+@njit(cache=True)
+def strong_pairs_kernel(matrix, threshold):
+    """Upper-triangle entries of a square matrix with |value| > threshold, without index temporaries"""
+    n = matrix.shape[0]
+    size = n * (n - 1) // 2
+    rows = np.empty(size, dtype=np.int64)
+    cols = np.empty(size, dtype=np.int64)
+    values = np.empty(size, dtype=np.float64)
+    k = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            value = matrix[i, j]
+            if value > threshold or value < -threshold:  # NaN fails both
+                rows[k] = i
+                cols[k] = j
+                values[k] = value
+                k += 1
+    return rows[:k], cols[:k], values[:k]
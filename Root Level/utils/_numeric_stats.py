@@ -0,0 +1,61 @@
+import os
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+# Columns of the per-column statistics returned by column_stats
+STAT_NAMES = ('count', 'mean', 'std', 'min', 'max', 'q25', 'median', 'q75', 'outliers')
+
+# describe() labels for the STAT_NAMES it computes
+DESCRIBE_NAMES = {'25%': 'q25', '50%': 'median', '75%': 'q75'}
+
+# Below this many cells (or on a single core) pandas/NumPy beat the numba kernels' JIT and thread start-up
+PARALLEL_MIN_CELLS = 2_000_000
+
+@lru_cache(maxsize=None)
+def _kernels():
+    """Numba kernels, imported on first use (None when numba is not installed)"""
+    try:
+        from . import _numba_kernels
+    except ImportError:  # Optional accelerator; fall back to pandas/NumPy
+        return None
+    return _numba_kernels
+
+def _kernels_for(cells: int):
+    """Numba kernels when an input of this many cells is large enough to pay for them, else None"""
+    if cells < PARALLEL_MIN_CELLS or (os.cpu_count() or 1) < 2:
+        return None
+    return _kernels()
+
+def column_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Count, mean, std, min, max, quartiles and IQR outlier count for each numeric column"""
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    kernels = _kernels_for(values.size)
+    if kernels is not None:
+        # Column-major so each thread reads one contiguous column
+        stats = kernels.column_stats_kernel(np.asfortranarray(values))
+        return pd.DataFrame(stats, index=df.columns, columns=list(STAT_NAMES))
+
+    if df.shape[1] == 0:
+        return pd.DataFrame(index=df.columns, columns=list(STAT_NAMES), dtype=np.float64)
+
+    stats = pd.DataFrame(values, columns=df.columns).describe().T.rename(columns=DESCRIBE_NAMES)
+    iqr = (stats['q75'] - stats['q25']).to_numpy()
+    lower_bound = stats['q25'].to_numpy() - 1.5 * iqr
+    upper_bound = stats['q75'].to_numpy() + 1.5 * iqr
+    stats['outliers'] = ((values < lower_bound) | (values > upper_bound)).sum(axis=0)
+    return stats[list(STAT_NAMES)].astype(np.float64)
+
+def strong_pairs(matrix: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row indices, column indices and values of upper-triangle entries with |value| > threshold"""
+    kernels = _kernels_for(matrix.size)
+    if kernels is not None:
+        return kernels.strong_pairs_kernel(np.ascontiguousarray(matrix, dtype=np.float64), float(threshold))
+
+    # Upper triangle without the diagonal: each pair once
+    rows, cols = np.triu_indices_from(matrix, k=1)
+    values = matrix[rows, cols]
+    strong = np.abs(values) > threshold
+    return rows[strong], cols[strong], values[strong]
@@ -1,8 +1,28 @@
 import streamlit as st
 import pandas as pd
 import json
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Iterator, Iterable
 import openai
+from openai import OpenAI
+
+def batched(chunks: Iterable[str], interval: float = 0.03) -> Iterator[str]:
+    """Coalesce streamed text chunks so the UI receives at most one update per interval"""
+    buffer = []
+    last_flush = time.monotonic()
+    
+    for chunk in chunks:
+        buffer.append(chunk)
+        if time.monotonic() - last_flush >= interval:
+            yield "".join(buffer)
+            buffer.clear()
+            last_flush = time.monotonic()
+    
+    if buffer:
+        yield "".join(buffer)
+
+class ChatbotError(Exception):
+    """A failed chat request, carrying the message to show the user"""
 
 class ExcelChatbot:
     """AI-powered chatbot for Excel data analysis using OpenAI API"""
@@ -13,8 +33,7 @@ class ExcelChatbot:
         self.max_tokens = 500
         self.temperature = 0.1
         
-        if self.api_key:
-            openai.api_key = self.api_key
+        self._client = OpenAI(api_key=self.api_key) if self.api_key else None
     
     def _get_api_key(self) -> Optional[str]:
         """Safely retrieve OpenAI API key from Streamlit secrets"""
@@ -32,12 +51,41 @@ class ExcelChatbot:
             data_context: Processed data information from DataProcessor
             
         Returns:
-            AI-generated response string
+            AI-generated response string, or the error message on failure
+        """
+        
+        try:
+            return self.finalize_response("".join(self.stream_response(user_query, data_context)))
+        except ChatbotError as e:
+            # Error messages are shown as-is, without response formatting
+            return str(e)
+    
+    def finalize_response(self, response: str) -> str:
+        """Apply formatting to a complete (possibly streamed) response"""
+        response = response.strip()
+        
+        # Post-process response for better formatting; setup messages are shown as-is
+        return self._format_response(response) if self.api_key else response
+    
+    def stream_response(self, user_query: str, data_context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream the AI response as text chunks as they arrive from the API
+        
+        Args:
+            user_query: User's natural language question
+            data_context: Processed data information from DataProcessor
+            
+        Yields:
+            Response text fragments
+            
+        Raises:
+            ChatbotError: with a user-facing message when the API call fails, even mid-stream
         """
         
         if not self.api_key:
-            return ("🔑 **OpenAI API Key Required**: To use the chatbot feature, please add your OpenAI API key to Streamlit secrets. "
+            yield ("🔑 **OpenAI API Key Required**: To use the chatbot feature, please add your OpenAI API key to Streamlit secrets. "
                    "You can get an API key from https://platform.openai.com/api-keys")
+            return
         
         try:
             # Prepare context for the AI
@@ -52,42 +100,43 @@ class ExcelChatbot:
                 {"role": "user", "content": user_query}
             ]
             
-            # Make API call to OpenAI
-            response = openai.ChatCompletion.create(
+            # Make streaming API call to OpenAI
+            stream = self._client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
                 presence_penalty=0,
-                frequency_penalty=0
+                frequency_penalty=0,
+                stream=True
             )
             
-            # Extract and return the response
-            ai_response = response.choices[0].message.content.strip()
-            
-            # Post-process response for better formatting
-            ai_response = self._format_response(ai_response)
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
             
-            return ai_response
-            
-        except openai.error.AuthenticationError:
+        except Exception as e:
+            raise ChatbotError(self._error_message(e)) from e
+    
+    def _error_message(self, error: Exception) -> str:
+        """Map OpenAI client errors to user-facing messages"""
+        
+        if isinstance(error, openai.AuthenticationError):
             return ("🔐 **Authentication Error**: The provided OpenAI API key is invalid. "
                    "Please check your API key in the Streamlit secrets configuration.")
-            
-        except openai.error.RateLimitError:
+        
+        if isinstance(error, openai.RateLimitError):
+            if getattr(error, 'code', None) == 'insufficient_quota':
+                return ("💳 **Quota Exceeded**: You have exceeded your OpenAI API quota. "
+                       "Please check your OpenAI account billing.")
             return ("⚠️ **Rate Limit Exceeded**: You have exceeded your OpenAI API rate limit. "
                    "Please try again in a few moments.")
-            
-        except openai.error.QuotaExceededError:
-            return ("💳 **Quota Exceeded**: You have exceeded your OpenAI API quota. "
-                   "Please check your OpenAI account billing.")
-            
-        except openai.error.APIError as e:
-            return f"🛠️ **API Error**: There was an issue with the OpenAI API: {str(e)}"
-            
-        except Exception as e:
-            return ("❌ **Error**: I encountered an unexpected error while processing your question. "
-                   "Please try rephrasing your question or contact support.")
+        
+        if isinstance(error, openai.APIError):
+            return f"🛠️ **API Error**: There was an issue with the OpenAI API: {str(error)}"
+        
+        return ("❌ **Error**: I encountered an unexpected error while processing your question. "
+               "Please try rephrasing your question or contact support.")
     
     def _prepare_context_summary(self, data_context: Dict[str, Any]) -> str:
         """Prepare a concise summary of the data for AI context"""
@@ -134,8 +183,7 @@ class ExcelChatbot:
                     summary_parts.append(f"Columns with missing values: {', '.join(missing_cols[:5])}")
             
             # Basic statistics (if available)
-            statistics = data_context.get('statistics', {})
-            if statistics and numeric_cols:
+            if data_context.get('statistics_available') and numeric_cols:
                 summary_parts.append("Basic statistics available for numeric columns.")
             
             return "\\n".join(summary_parts)
@@ -211,8 +259,10 @@ Always be honest about the limitations of your knowledge about their specific da
             suggestions.append(f"How does {numeric_cols[0]} vary by {categorical_cols[0]}?")
         
         # Data quality suggestions
-        missing_values = data_context.get('missing_values', {})
-        if any(count > 0 for count in missing_values.values()):
+        has_missing = data_context.get('has_missing')
+        if has_missing is None:
+            has_missing = any(count > 0 for count in data_context.get('missing_values', {}).values())
+        if has_missing:
             suggestions.append("How should I handle the missing values in this dataset?")
         
         suggestions.extend([
@@ -241,23 +291,3 @@ Always be honest about the limitations of your knowledge about their specific da
                 "model": "N/A",
                 "setup": "OpenAI API key required in Streamlit secrets"
             }
-```
-
-*[Continue with remaining files...]*
-
-## **Quick Copy Instructions:**
-
-1. **Create each file** in your repository with the exact path and filename
-2. **Copy the content** from each section above  
-3. **Replace placeholders** like `yourusername` and `your-repo-name`
-4. **Add your OpenAI API key** to Streamlit Cloud secrets if you want chatbot functionality
-
-## **🚀 Next Steps:**
-
-1. **Create GitHub repository**
-2. **Copy all files above**
-3. **Push to GitHub**
-4. **Deploy on Streamlit Cloud**
-5. **Test with Excel files**
-
-The complete application is ready for deployment! 🎉
@@ -1,6 +1,11 @@
+import streamlit as st
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any
+from ._numeric_stats import column_stats
+
+# Above this many rows, duplicates are counted on one 64-bit hash per row
+HASHED_DUPLICATES_MIN_ROWS = 100_000
 
 class DataProcessor:
     """Advanced data processing and analysis utilities"""
@@ -8,71 +13,98 @@ class DataProcessor:
     def __init__(self):
         pass
     
+    def compute_base_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Null, duplicate, memory and cardinality counts shared by the reports (cached per DataFrame content)"""
+        return _cached_base_stats(df)
+    
+    def _base_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Compute the frame-wide counts the summary, quality report and profiles all need"""
+        null_per_col = df.isnull().sum()
+        return {
+            'null_per_col': null_per_col,
+            'null_total': int(null_per_col.sum()),
+            'dup_count': self._count_duplicate_rows(df),
+            'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024 * 1024),
+            'nunique': df.nunique()
+        }
+    
+    @staticmethod
+    def _count_duplicate_rows(df: pd.DataFrame) -> int:
+        """Number of duplicated rows; large frames compare row hashes instead of full rows"""
+        if len(df) > HASHED_DUPLICATES_MIN_ROWS:
+            # uint64 collisions are negligible for a reporting metric
+            row_hashes = pd.util.hash_pandas_object(df, index=False)
+            return int(row_hashes.duplicated().sum())
+        return int(df.duplicated().sum())
+    
     def get_data_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Generate comprehensive data summary (cached per DataFrame content)"""
+        return _cached_data_summary(df)
+    
+    def _data_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate comprehensive data summary"""
+        base_stats = self.compute_base_stats(df)
         summary = {
             'total_rows': len(df),
             'total_columns': len(df.columns),
-            'missing_values': df.isnull().sum().sum(),
-            'duplicate_rows': df.duplicated().sum(),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024 * 1024),
+            'missing_values': base_stats['null_total'],
+            'duplicate_rows': base_stats['dup_count'],
+            'memory_usage_mb': base_stats['memory_usage_mb'],
             'numeric_columns': len(df.select_dtypes(include=['number']).columns),
-            'categorical_columns': len(df.select_dtypes(include=['object', 'category']).columns),
+            'categorical_columns': len(df.select_dtypes(include=['object', 'string', 'category']).columns),
             'datetime_columns': len(df.select_dtypes(include=['datetime64']).columns)
         }
         
         return summary
     
     def generate_quality_report(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Generate data quality assessment report (cached per DataFrame content)"""
+        return _cached_quality_report(df)
+    
+    def _quality_report(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate data quality assessment report"""
         quality_metrics = {}
+        base_stats = self.compute_base_stats(df)
         
         # Missing data percentage
-        missing_percentage = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
+        missing_percentage = (base_stats['null_total'] / (len(df) * len(df.columns))) * 100
         quality_metrics['missing_data_percentage'] = f"{missing_percentage:.2f}%"
         
         # Duplicate rows
-        duplicate_count = df.duplicated().sum()
+        duplicate_count = base_stats['dup_count']
         quality_metrics['duplicate_rows'] = duplicate_count
         
         # Data completeness by column
-        completeness = ((df.count() / len(df)) * 100).round(2)
+        completeness = (((len(df) - base_stats['null_per_col']) / len(df)) * 100).round(2)
         lowest_completeness = completeness.min()
         quality_metrics['lowest_column_completeness'] = f"{lowest_completeness:.2f}%"
         
         # Unique values ratio for categorical columns
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
         if len(categorical_cols) > 0:
-            uniqueness_ratios = []
-            for col in categorical_cols:
-                ratio = (df[col].nunique() / len(df)) * 100
-                uniqueness_ratios.append(ratio)
+            uniqueness_ratios = (base_stats['nunique'][categorical_cols] / len(df)) * 100
             
-            avg_uniqueness = np.mean(uniqueness_ratios)
+            avg_uniqueness = uniqueness_ratios.mean()
             quality_metrics['avg_categorical_uniqueness'] = f"{avg_uniqueness:.2f}%"
         else:
             quality_metrics['avg_categorical_uniqueness'] = "N/A"
         
-        # Outliers in numeric columns (using IQR method)
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        # Outliers in numeric columns (using IQR method), all columns in one kernel pass
+        numeric_df = df.select_dtypes(include=['number'])
         total_outliers = 0
         
-        for col in numeric_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-            total_outliers += len(outliers)
+        if numeric_df.size > 0:
+            total_outliers = int(column_stats(numeric_df)['outliers'].sum())
         
         quality_metrics['potential_outliers'] = total_outliers
         
         return quality_metrics
     
     def detect_data_types(self, df: pd.DataFrame) -> Dict[str, List[str]]:
+        """Detect and categorize column data types (cached per DataFrame content)"""
+        return _cached_data_types(df)
+    
+    def _data_types(self, df: pd.DataFrame) -> Dict[str, List[str]]:
         """Detect and categorize column data types"""
         type_categories = {
             'numeric': [],
@@ -83,78 +115,97 @@ class DataProcessor:
             'mixed': []
         }
         
-        for col in df.columns:
-            col_data = df[col].dropna()
-            
-            if pd.api.types.is_numeric_dtype(col_data):
-                type_categories['numeric'].append(col)
-            elif pd.api.types.is_datetime64_any_dtype(col_data):
-                type_categories['datetime'].append(col)
-            elif pd.api.types.is_bool_dtype(col_data):
-                type_categories['boolean'].append(col)
-            elif col_data.dtype == 'object':
-                # Try to determine if it's categorical or text
-                unique_ratio = col_data.nunique() / len(col_data)
-                avg_length = col_data.astype(str).str.len().mean()
-                
-                if unique_ratio < 0.1 and avg_length < 50:  # Likely categorical
-                    type_categories['categorical'].append(col)
-                elif avg_length > 100:  # Likely text
-                    type_categories['text'].append(col)
-                else:
-                    type_categories['mixed'].append(col)
-            else:
-                type_categories['mixed'].append(col)
+        # Classify from dtype metadata; only string columns need a look at the values
+        dtypes = df.dtypes
+        kinds = np.array([dtype.kind for dtype in dtypes])
+        is_string = np.array([pd.api.types.is_string_dtype(dtype) for dtype in dtypes], dtype=bool)
+        is_category = np.array([isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes], dtype=bool)
+        
+        unique_ratio = np.full(len(dtypes), np.nan)
+        avg_length = np.full(len(dtypes), np.nan)
+        if is_string.any():
+            # Try to determine if string columns are categorical or text
+            string_data = df.loc[:, is_string]
+            unique_ratio[is_string] = (string_data.nunique() / string_data.count()).to_numpy(dtype=np.float64)
+            avg_length[is_string] = string_data.apply(
+                lambda column: column.dropna().astype(str).str.len().mean()
+            ).to_numpy(dtype=np.float64)
+        
+        categories = np.select(
+            [
+                np.isin(kinds, ['i', 'u', 'f', 'c']),
+                kinds == 'M',
+                kinds == 'b',
+                is_category,
+                is_string & (unique_ratio < 0.1) & (avg_length < 50),  # Likely categorical
+                is_string & (avg_length > 100)                          # Likely text
+            ],
+            ['numeric', 'datetime', 'boolean', 'categorical', 'categorical', 'text'],
+            default='mixed'
+        )
+        
+        for col, category in zip(df.columns, categories):
+            type_categories[category].append(col)
         
         return type_categories
     
     def generate_column_profiles(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Generate detailed profiles for each column (cached per DataFrame content)"""
+        return _cached_column_profiles(df)
+    
+    def _column_profiles(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
         """Generate detailed profiles for each column"""
         profiles = {}
+        base_stats = self.compute_base_stats(df)
+        
+        # Moments, quartiles and outlier counts for all numeric columns at once
+        numeric_df = df.select_dtypes(include=['number'])
+        numeric_stats = {}
+        if numeric_df.size > 0:
+            numeric_stats = column_stats(numeric_df).to_dict(orient='index')
         
         for col in df.columns:
             col_data = df[col]
+            null_count = base_stats['null_per_col'][col]
+            unique_count = base_stats['nunique'][col]
             profile = {
                 'name': col,
                 'dtype': str(col_data.dtype),
-                'count': col_data.count(),
-                'null_count': col_data.isnull().sum(),
-                'null_percentage': (col_data.isnull().sum() / len(df)) * 100,
-                'unique_count': col_data.nunique(),
-                'unique_percentage': (col_data.nunique() / len(df)) * 100
+                'count': len(col_data) - null_count,
+                'null_count': null_count,
+                'null_percentage': (null_count / len(df)) * 100,
+                'unique_count': unique_count,
+                'unique_percentage': (unique_count / len(df)) * 100
             }
             
-            if pd.api.types.is_numeric_dtype(col_data):
+            if col in numeric_stats:
                 # Numeric column statistics
+                stats = numeric_stats[col]
                 profile.update({
-                    'mean': col_data.mean(),
-                    'std': col_data.std(),
-                    'min': col_data.min(),
-                    'max': col_data.max(),
-                    'median': col_data.median(),
-                    'q25': col_data.quantile(0.25),
-                    'q75': col_data.quantile(0.75)
+                    'mean': stats['mean'],
+                    'std': stats['std'],
+                    'min': stats['min'],
+                    'max': stats['max'],
+                    'median': stats['median'],
+                    'q25': stats['q25'],
+                    'q75': stats['q75']
                 })
                 
-                # Detect potential outliers
-                Q1 = col_data.quantile(0.25)
-                Q3 = col_data.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outliers = col_data[(col_data < lower_bound) | (col_data > upper_bound)]
-                profile['outlier_count'] = len(outliers)
+                # Potential outliers (IQR method)
+                profile['outlier_count'] = int(stats['outliers'])
                 
-            elif col_data.dtype == 'object':
+            elif pd.api.types.is_string_dtype(col_data.dtype) or isinstance(col_data.dtype, pd.CategoricalDtype):
                 # Text/categorical column statistics
+                modes = col_data.mode()
+                value_counts = col_data.value_counts()
                 profile.update({
-                    'most_frequent': col_data.mode().iloc[0] if len(col_data.mode()) > 0 else None,
-                    'most_frequent_count': col_data.value_counts().iloc[0] if len(col_data.value_counts()) > 0 else 0
+                    'most_frequent': modes.iloc[0] if len(modes) > 0 else None,
+                    'most_frequent_count': value_counts.iloc[0] if len(value_counts) > 0 else 0
                 })
                 
-                # String length statistics for text columns
-                if col_data.dropna().astype(str).str.len().mean() > 10:
-                    str_lengths = col_data.dropna().astype(str).str.len()
+                # String length statistics for text columns, from a single length pass
+                str_lengths = col_data.dropna().astype(str).str.len().to_numpy(dtype=np.int64)
+                if len(str_lengths) > 0 and str_lengths.mean() > 10:
                     profile.update({
                         'avg_length': str_lengths.mean(),
                         'min_length': str_lengths.min(),
@@ -166,6 +217,10 @@ class DataProcessor:
         return profiles
     
     def suggest_visualizations(self, df: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+        """Suggest appropriate visualizations based on data types and characteristics (cached per DataFrame content)"""
+        return _cached_visualization_suggestions(df)
+    
+    def _visualization_suggestions(self, df: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
         """Suggest appropriate visualizations based on data types and characteristics"""
         suggestions = {
             'recommended': [],
@@ -173,7 +228,7 @@ class DataProcessor:
         }
         
         numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
         
         # Recommended visualizations
         if len(numeric_cols) >= 2:
@@ -250,7 +305,8 @@ class DataProcessor:
                 'remove_outliers': False
             }
         
-        cleaned_df = df.copy()
+        # Every step below returns a new frame, so the input's data is never duplicated up front
+        cleaned_df = df.copy(deep=False)
         
         # Remove duplicates
         if cleaning_options.get('remove_duplicates', False):
@@ -260,20 +316,119 @@ class DataProcessor:
             if rows_removed > 0:
                 print(f"Removed {rows_removed} duplicate rows")
         
+        # Collect fill values for every column with gaps, then fill in a single call
+        fill_values = {}
+        columns_with_missing = cleaned_df.columns[cleaned_df.isnull().any().to_numpy()]
+        
         # Fill missing values in numeric columns
         if cleaning_options.get('fill_numeric_missing', False):
-            numeric_cols = cleaned_df.select_dtypes(include=['number']).columns
-            for col in numeric_cols:
-                if cleaned_df[col].isnull().any():
-                    median_value = cleaned_df[col].median()
-                    cleaned_df[col].fillna(median_value, inplace=True)
+            numeric_cols = cleaned_df.select_dtypes(include=['number']).columns.intersection(columns_with_missing)
+            fill_values.update(cleaned_df[numeric_cols].median().to_dict())
         
         # Fill missing values in categorical columns
         if cleaning_options.get('fill_categorical_missing', False):
-            categorical_cols = cleaned_df.select_dtypes(include=['object', 'category']).columns
-            for col in categorical_cols:
-                if cleaned_df[col].isnull().any():
-                    mode_value = cleaned_df[col].mode().iloc[0] if len(cleaned_df[col].mode()) > 0 else 'Unknown'
-                    cleaned_df[col].fillna(mode_value, inplace=True)
+            categorical_cols = cleaned_df.select_dtypes(include=['object', 'string', 'category']).columns.intersection(
+                columns_with_missing
+            )
+            if len(categorical_cols) > 0:
+                modes = cleaned_df[categorical_cols].mode()
+                mode_values = modes.iloc[0] if len(modes) > 0 else pd.Series(index=categorical_cols, dtype=object)
+                fill_values.update({
+                    col: 'Unknown' if pd.isna(value) else value
+                    for col, value in mode_values.items()
+                })
+        
+        if fill_values:
+            # Categorical columns (see optimize_dtypes) only accept fill values that are already categories
+            for col, value in fill_values.items():
+                column = cleaned_df[col]
+                if isinstance(column.dtype, pd.CategoricalDtype) and value not in column.cat.categories:
+                    cleaned_df[col] = column.cat.add_categories([value])
+            cleaned_df = cleaned_df.fillna(fill_values)
         
         return cleaned_df
+    
+    def optimize_dtypes(self, df: pd.DataFrame, category_threshold: float = 0.5) -> pd.DataFrame:
+        """Downcast numeric columns and store low-cardinality text columns as categories"""
+        optimized = {}
+        
+        # Integers downcast to the smallest type that holds their range
+        for col in df.select_dtypes(include=['integer']).columns:
+            optimized[col] = pd.to_numeric(df[col], downcast='integer')
+        
+        # Floats only become float32 when every value round-trips exactly
+        # (to_numeric's float downcast tolerates rounding, e.g. 0.1)
+        float_cols = [col for col, dtype in df.dtypes.items() if dtype == np.dtype(np.float64)]
+        for col in float_cols:
+            values = df[col].to_numpy()
+            with np.errstate(over='ignore'):
+                narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed, values, equal_nan=True):
+                optimized[col] = pd.Series(narrowed, index=df.index, name=col)
+        
+        text_cols = df.select_dtypes(include=['object', 'string']).columns
+        if len(text_cols) > 0 and len(df) > 0:
+            unique_ratio = df[text_cols].nunique() / len(df)
+            for col in unique_ratio.index[unique_ratio < category_threshold]:
+                optimized[col] = df[col].astype('category')
+        
+        if not optimized:
+            return df
+        
+        # Replace columns on a shallow copy so the caller's frame is left untouched
+        df = df.copy(deep=False)
+        for col, values in optimized.items():
+            df[col] = values
+        return df
+    
+    def get_statistics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Descriptive statistics for numeric columns, computed on demand"""
+        # Same single-pass kernel as the column profiles, laid out like describe()
+        stats = column_stats(df.select_dtypes(include=['number']))
+        stats = stats.rename(columns={'q25': '25%', 'median': '50%', 'q75': '75%'})
+        return stats[['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']].T
+    
+    def compute_correlation(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Pearson correlation of numeric columns via a single float32 matrix product"""
+        values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        # pandas drops missing values pair by pair; keep its semantics when NaNs are present
+        if len(values) < 2 or np.isnan(values).any():
+            return df.corr()
+        
+        # Center in float64 first: large offsets (e.g. 1e8 + small steps) would lose their
+        # variation in float32; the centered values are safe to narrow for the product
+        centered = (values - values.mean(axis=0)).astype(np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (centered.T @ centered) / (len(centered) - 1)
+            std = np.sqrt(np.diag(cov))
+            corr = np.clip(cov / np.outer(std, std), -1.0, 1.0)
+        
+        return pd.DataFrame(corr, index=df.columns, columns=df.columns)
+
+
+# Streamlit reruns the script on every interaction; these analyses are pure functions of the
+# DataFrame, so cache them on its content (hashed by Streamlit) rather than recomputing
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_base_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    return DataProcessor()._base_stats(df)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_data_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    return DataProcessor()._data_summary(df)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_quality_report(df: pd.DataFrame) -> Dict[str, Any]:
+    return DataProcessor()._quality_report(df)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_data_types(df: pd.DataFrame) -> Dict[str, List[str]]:
+    return DataProcessor()._data_types(df)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_column_profiles(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    return DataProcessor()._column_profiles(df)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_visualization_suggestions(df: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    return DataProcessor()._visualization_suggestions(df)
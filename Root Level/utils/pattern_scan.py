@@ -0,0 +1,102 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+import pandas as pd
+
+@lru_cache(maxsize=None)
+def _hyperscan_database(patterns: Tuple[str, ...]):
+    """Compile patterns into one Hyperscan database, once per pattern set (None if unavailable)"""
+    try:
+        import hyperscan
+    except ImportError:  # Optional accelerator; fall back to Python's re engine
+        return None
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+        return database
+    except hyperscan.error:
+        # Pattern syntax Hyperscan does not support - keep the re fallback
+        return None
+
+class PatternScanner:
+    """Case-insensitive multi-pattern matching over string columns"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(patterns)
+        # Single alternation so each column is scanned once instead of once per pattern
+        self.regex = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.patterns),
+            re.IGNORECASE
+        )
+        self._hs_scratch = None
+
+    @property
+    def _hs_db(self):
+        """Hyperscan database, imported and compiled on first scan and shared across instances"""
+        return _hyperscan_database(self.patterns)
+
+    def contains_any(self, column: pd.Series) -> bool:
+        """Check whether any cell in the column matches any pattern"""
+        return self.first_match(column) is not None
+
+    def first_match(self, column: pd.Series) -> Optional[str]:
+        """Return the first pattern found in the column, or None if no cell matches"""
+        values = column.dropna()
+        if not isinstance(values.dtype, pd.StringDtype):
+            values = values.astype(str)
+        if values.empty:
+            return None
+
+        if self._hs_db is None:
+            # Pass the pattern text rather than the compiled regex so Arrow-backed
+            # strings stay on pyarrow's regex kernel
+            hits = values.str.contains(self.regex.pattern, case=False, regex=True, na=False)
+            if not hits.any():
+                return None
+            # Identify the pattern from the first flagged cell only
+            flagged_cell = values[hits].iloc[0]
+            return next(
+                (pattern for pattern in self.patterns if re.search(pattern, flagged_cell, re.IGNORECASE)),
+                self.regex.pattern
+            )
+
+        # One scan over the joined column as a quick negative filter: any match inside a cell is also
+        # a match in the joined buffer. The converse does not hold - '\s', '[^>]' and friends match the
+        # separator too - so a hit is confirmed cell by cell before anything is reported
+        cells = [value.encode('utf-8', 'replace') for value in values.tolist()]
+        if not self._hyperscan_match(b'\n'.join(cells), stop_at_first=True):
+            return None
+
+        for cell in cells:
+            pattern_ids = self._hyperscan_match(cell)
+            if pattern_ids:
+                # Lowest id = first pattern in list order, as reported by the re fallback
+                return self.patterns[min(pattern_ids)]
+        return None
+
+    def _hyperscan_match(self, buffer: bytes, stop_at_first: bool = False) -> List[int]:
+        """Scan a buffer with Hyperscan and return the ids of the patterns that matched"""
+        import hyperscan
+
+        matches = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            matches.append(pattern_id)
+            return stop_at_first  # True terminates the scan early
+
+        # The database is shared, so each scanner scans with its own scratch space
+        if self._hs_scratch is None:
+            self._hs_scratch = hyperscan.Scratch(self._hs_db)
+
+        try:
+            self._hs_db.scan(buffer, match_event_handler=on_match, scratch=self._hs_scratch)
+        except hyperscan.ScanTerminated:
+            pass
+
+        return matches
@@ -2,10 +2,15 @@ import streamlit as st
 import hashlib
 import re
 import time
+from collections import deque
 from typing import Dict, Any, Optional, List
 import pandas as pd
 import logging
 from dataclasses import dataclass
+from .pattern_scan import PatternScanner
+
+# Scrub passes over user input; each pass can only peel one layer of nested payloads
+MAX_SCRUB_PASSES = 5
 
 @dataclass
 class SecurityLimits:
@@ -23,6 +28,16 @@ class SecurityConfig:
     def __init__(self):
         self.limits = SecurityLimits()
         self.suspicious_patterns = self._load_suspicious_patterns()
+        # Hyperscan-backed when available, compiled re alternation otherwise
+        self._threat_scanner = PatternScanner(self.suspicious_patterns)
+        # Script tags, javascript:/vbscript: URLs and quoted event handlers, scrubbed in one pass
+        self._input_scrubber = re.compile(
+            r'<script[^>]*>.*?</script>'
+            r'|javascript:'
+            r'|vbscript:'
+            r'|on\w+\s*=\s*(?:"[^"]*"|\'[^\']*\')',
+            re.IGNORECASE | re.DOTALL
+        )
         self.api_call_tracker = {}
         self._setup_logging()
 
@@ -135,7 +150,7 @@ class SecurityConfig:
                 validation_result['safe'] = False
 
             # Check for suspicious content in string columns
-            string_columns = df.select_dtypes(include=['object']).columns
+            string_columns = df.select_dtypes(include=['object', 'string', 'category']).columns
 
             for col in string_columns:
                 if self._scan_column_for_threats(df[col]):
@@ -172,13 +187,11 @@ class SecurityConfig:
         """Scan a column for suspicious patterns"""
 
         try:
-            # Convert to string and check against patterns
-            column_str = column.dropna().astype(str)
-
-            for pattern in self.suspicious_patterns:
-                if column_str.str.contains(pattern, case=False, regex=True, na=False).any():
-                    self.logger.warning(f"Suspicious pattern detected: {pattern}")
-                    return True
+            # All patterns are matched in one pass over the column
+            pattern = self._threat_scanner.first_match(column)
+            if pattern is not None:
+                self.logger.warning(f"Suspicious pattern detected: {pattern}")
+                return True
 
             return False
 
@@ -199,11 +212,19 @@ class SecurityConfig:
             'credit_card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'
         }
 
-        string_columns = df.select_dtypes(include=['object']).columns
+        # One pass per column over all PII patterns (non-capturing groups keep str.contains quiet)
+        combined_pattern = '|'.join(f'(?:{pattern})' for pattern in pii_patterns.values())
+
+        string_columns = df.select_dtypes(include=['object', 'string', 'category']).columns
 
         for col in string_columns:
             col_data = df[col].dropna().astype(str)
+            hits = col_data.str.contains(combined_pattern, regex=True, na=False)
+            if not hits.any():
+                continue
 
+            # Only the matching cells are checked again to name the PII types
+            col_data = col_data[hits]
             for pii_type, pattern in pii_patterns.items():
                 if col_data.str.contains(pattern, regex=True, na=False).any():
                     pii_warnings.append(
@@ -216,35 +237,24 @@ class SecurityConfig:
     def validate_api_usage(self, user_id: str = "default") -> Dict[str, Any]:
         """Validate API usage limits"""
 
-        current_time = time.time()
-        current_minute = int(current_time // 60)
-
-        if user_id not in self.api_call_tracker:
-            self.api_call_tracker[user_id] = {}
-
-        user_tracker = self.api_call_tracker[user_id]
+        # Sliding 60s window: each user keeps only the timestamps of their last N calls
+        max_calls = self.limits.MAX_API_CALLS_PER_MINUTE
+        current_time = time.monotonic()
+        recent_calls = self.api_call_tracker.setdefault(user_id, deque(maxlen=max_calls))
 
-        # Clean old entries (older than 1 minute)
-        old_minutes = [minute for minute in user_tracker.keys() if minute < current_minute - 1]
-        for old_minute in old_minutes:
-            del user_tracker[old_minute]
-
-        # Count current minute calls
-        current_calls = user_tracker.get(current_minute, 0)
-
-        if current_calls >= self.limits.MAX_API_CALLS_PER_MINUTE:
+        if len(recent_calls) == max_calls and current_time - recent_calls[0] < 60:
             return {
                 'allowed': False,
-                'message': f"API rate limit exceeded. Maximum {self.limits.MAX_API_CALLS_PER_MINUTE} calls per minute.",
-                'retry_after': 60 - (current_time % 60)
+                'message': f"API rate limit exceeded. Maximum {max_calls} calls per minute.",
+                'retry_after': 60 - (current_time - recent_calls[0])
             }
 
-        # Increment counter
-        user_tracker[current_minute] = current_calls + 1
+        # Record the call; the oldest timestamp drops off automatically once full
+        recent_calls.append(current_time)
 
         return {
             'allowed': True,
-            'remaining_calls': self.limits.MAX_API_CALLS_PER_MINUTE - (current_calls + 1)
+            'remaining_calls': max_calls - sum(1 for call_time in recent_calls if current_time - call_time < 60)
         }
 
     def sanitize_input(self, input_text: str) -> str:
@@ -253,22 +263,20 @@ class SecurityConfig:
         if not isinstance(input_text, str):
             input_text = str(input_text)
 
-        # Remove or escape potentially dangerous characters
-        sanitized = input_text
-
-        # Remove script tags
-        sanitized = re.sub(r'<script[^>]*>.*?</script>', '', sanitized, flags=re.IGNORECASE | re.DOTALL)
+        # Limit length first so the scrubbing below works on bounded input
+        sanitized = input_text[:10000]  # 10KB limit for user input
 
-        # Remove javascript: and vbscript: URLs
-        sanitized = re.sub(r'javascript:', '', sanitized, flags=re.IGNORECASE)
-        sanitized = re.sub(r'vbscript:', '', sanitized, flags=re.IGNORECASE)
-
-        # Remove event handlers
-        sanitized = re.sub(r'on\w+\s*=\s*["'][^"']*["']', '', sanitized, flags=re.IGNORECASE)
-
-        # Limit length
-        if len(sanitized) > 10000:  # 10KB limit for user input
-            sanitized = sanitized[:10000]
+        # Remove script tags, javascript:/vbscript: URLs and event handlers in a single scan;
+        # repeat only if a removal stitched together a new match (e.g. "javajavascript:script:")
+        for _ in range(MAX_SCRUB_PASSES):
+            sanitized, removed = self._input_scrubber.subn('', sanitized)
+            if not removed:
+                break
+        else:
+            # Still nesting after the pass limit: deliberately adversarial, keep nothing
+            if self._input_scrubber.search(sanitized):
+                self.logger.warning("Input rejected: nested script content beyond scrub limit")
+                return ''
 
         return sanitized.strip()
 
@@ -318,7 +326,7 @@ class SecurityConfig:
                     "📈 Consider sampling large datasets for faster processing"
                 )
 
-            string_cols = df.select_dtypes(include=['object']).columns
+            string_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
             if len(string_cols) > 0:
                 recommendations.append(
                     "🔍 Be cautious when sharing text columns that may contain sensitive information"
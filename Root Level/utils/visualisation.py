@@ -1,21 +1,244 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-from typing import List, Optional, Dict, Any
-
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
+from ._numeric_stats import strong_pairs
+from .data_processor import DataProcessor
+
+# Frames above this size aggregate bar charts with bincount instead of groupby
+FAST_AGG_MIN_ROWS = 50_000
+
+# Bars drawn per bar chart; the remaining categories still count towards the metrics
+BAR_CHART_MAX_CATEGORIES = 50
+
+# Heatmaps with more selected columns than this skip the per-cell value labels
+HEATMAP_MAX_ANNOTATED_COLUMNS = 15
+
+# Scatter plots above this many rows draw a uniform random sample (adjustable in the UI)
+SCATTER_MAX_POINTS = 50_000
+SCATTER_MIN_POINTS = 1_000
+
+# Point count above which scatter plots render with WebGL instead of SVG
+WEBGL_MIN_POINTS = 5_000
+
+def _fast_group_agg(keys: pd.Series, values: Optional[pd.Series], how: str) -> pd.Series:
+    """Group-wise sum/mean/count via factorize + bincount (matches groupby's NaN handling)"""
+    codes, uniques = pd.factorize(keys, sort=True)
+    valid = codes >= 0  # Missing keys are dropped, as in groupby
+    n_groups = len(uniques)
+
+    if how == 'count':
+        result = np.bincount(codes[valid], minlength=n_groups)
+    else:
+        numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid &= ~np.isnan(numbers)
+        sums = np.bincount(codes[valid], weights=numbers[valid], minlength=n_groups)
+        if how == 'sum':
+            result = sums
+        else:
+            counts = np.bincount(codes[valid], minlength=n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = sums / counts
+
+    return pd.Series(result, index=pd.Index(uniques, name=keys.name))
+
+@lru_cache(maxsize=None)
+def _polars():
+    """Polars module, imported on first use (None when polars is not installed)"""
+    try:
+        import polars
+    except ImportError:  # Optional accelerator; fall back to pandas
+        return None
+    return polars
+
+def _lazy(df, columns: List[str]):
+    """
+    Polars LazyFrame over only the given columns, or None when polars is unavailable or cannot convert them
+    Polars frames (e.g. a scan_parquet plan) pass straight through, so only the aggregated result is collected
+    """
+    pl = _polars()
+    if pl is None:
+        return None
+    columns = list(dict.fromkeys(columns))
+    if isinstance(df, (pl.LazyFrame, pl.DataFrame)):
+        return df.lazy().select(columns)
+    try:
+        return pl.from_pandas(df[columns]).lazy()
+    except Exception:  # e.g. object columns holding mixed types
+        return None
+
+def _bar_aggregation(df: pd.DataFrame, x_column: str, y_column: str, aggregation: str) -> pd.Series:
+    """Aggregate y_column per x_column category for the bar chart"""
+    lazy_frame = _lazy(df, [x_column] if aggregation == "count" else [x_column, y_column])
+    if lazy_frame is not None:
+        pl = _polars()
+        value = pl.len() if aggregation == "count" else getattr(pl.col(y_column), aggregation)()
+        result = (
+            lazy_frame.filter(pl.col(x_column).is_not_null())  # Missing keys are dropped, as in groupby
+            .group_by(x_column, maintain_order=True)
+            .agg(value.alias("value"))
+            .collect()
+            .to_pandas()
+        )
+        return result.set_index(x_column)["value"].rename(None if aggregation == "count" else y_column)
+
+    if len(df) > FAST_AGG_MIN_ROWS and aggregation in ("sum", "mean", "count"):
+        # Large frames: single bincount pass instead of building a GroupBy
+        values = None if aggregation == "count" else df[y_column]
+        return _fast_group_agg(df[x_column], values, aggregation)
+
+    # observed=True skips unused categories, sort=False skips the key sort
+    grouped = df.groupby(x_column, observed=True, sort=False)
+    if aggregation == "count":
+        # Count occurrences
+        return grouped.size()
+    # Apply aggregation function
+    return grouped[y_column].agg(aggregation)
+
+def _box_statistics(df: pd.DataFrame, x_column: str, y_column: str) -> pd.DataFrame:
+    """Mean, median, std and count of y_column per x_column category"""
+    lazy_frame = _lazy(df, [x_column, y_column])
+    if lazy_frame is not None:
+        pl = _polars()
+        column = pl.col(y_column)
+        result = (
+            lazy_frame.filter(pl.col(x_column).is_not_null())
+            .group_by(x_column)
+            .agg([
+                column.mean().alias('mean'),
+                column.median().alias('median'),
+                column.std().alias('std'),
+                column.count().alias('count')
+            ])
+            .sort(x_column)
+            .collect()
+            .to_pandas()
+        )
+        return result.set_index(x_column).round(3)
+
+    return df.groupby(x_column)[y_column].agg(['mean', 'median', 'std', 'count']).round(3)
+
+def _value_counts(df: pd.DataFrame, column: str) -> pd.Series:
+    """Category counts for the pie chart, unsorted (callers take the top N with nlargest)"""
+    lazy_frame = _lazy(df, [column])
+    if lazy_frame is not None:
+        pl = _polars()
+        counts = (
+            lazy_frame.drop_nulls(column)
+            .group_by(column)
+            .agg(pl.len().alias('count'))
+            .collect()
+            .to_pandas()
+        )
+        return counts.set_index(column)['count']
+
+    return df[column].value_counts(sort=False)
+
+def _classify_columns(df: pd.DataFrame) -> Tuple[List[str], List[str], List[str]]:
+    """Numeric, categorical and all column names of the frame"""
+    return (
+        df.select_dtypes(include=['number']).columns.tolist(),
+        df.select_dtypes(include=['object', 'string', 'category']).columns.tolist(),
+        df.columns.tolist()
+    )
+
+def _correlation(df: pd.DataFrame, columns: tuple) -> pd.DataFrame:
+    """Correlation matrix of the selected columns (one matrix product when there are no missing values)"""
+    return DataProcessor().compute_correlation(df[list(columns)])
+
+def _paired_values(df: pd.DataFrame, x_column: str, y_column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Float64 arrays of two columns, keeping only rows where both are present"""
+    x = df[x_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df[y_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~(np.isnan(x) | np.isnan(y))
+    return x[present], y[present]
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """Pearson correlation of two NaN-free arrays (NaN for fewer than 2 points or a constant input)"""
+    if len(x) < 2:
+        return np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.corrcoef(x, y)[0, 1])
+
+def _fit_line(x: np.ndarray, y: np.ndarray) -> Optional[Tuple[float, float]]:
+    """Closed-form least-squares slope and intercept (None for fewer than 2 points or a constant x)"""
+    if len(x) < 2:
+        return None
+    x_mean, y_mean = x.mean(), y.mean()
+    x_centered = x - x_mean
+    denominator = x_centered @ x_centered
+    if denominator == 0:
+        return None
+    slope = (x_centered @ (y - y_mean)) / denominator
+    return slope, y_mean - slope * x_mean
+
+def _downcast_for_viz(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame with float64 columns stored as float32 - charts cannot show the extra precision"""
+    float_columns = df.select_dtypes(include=['float64']).columns
+    if len(float_columns) == 0:
+        return df
+    return df.astype({col: 'float32' for col in float_columns})
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_downcast_for_viz(data_key: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """Chart frame shared across reruns (read-only: Plotly never modifies it)"""
+    return _downcast_for_viz(_df)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_figure(data_key: str, name: str, args: tuple, _build, _df: pd.DataFrame):
+    """Figure from _build(_df, *args), shared across reruns (read-only: st.plotly_chart never modifies it)"""
+    return _build(_df, *args)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_aggregation(data_key: str, name: str, args: tuple, _func, _df: pd.DataFrame):
+    """Result of _func(_df, *args), cached per dataset, aggregation and arguments"""
+    return _func(_df, *args)
+
+def clear_caches():
+    """Drop every cached chart frame, figure and aggregation (cache_resource entries outlive session state)"""
+    _cached_downcast_for_viz.clear()
+    _cached_figure.clear()
+    _cached_aggregation.clear()
+
+# Plotly is imported inside the chart methods so it only loads once a chart is drawn
 class ChartGenerator:
     """Interactive chart generation using Plotly"""
 
-    def __init__(self):
-        self.color_palette = px.colors.qualitative.Set3
+    def __init__(self, data_key: Optional[str] = None):
         self.default_height = 500
         self.default_width = None
+        # Identifies the loaded dataset (e.g. its file hash) so results can be cached across reruns
+        self.data_key = data_key
+
+    def _aggregate(self, func, df: pd.DataFrame, *args):
+        """Run an aggregation helper, through the cache when the dataset has a key"""
+        if self.data_key is None:
+            return func(df, *args)
+        # The key stands in for the frame, so reruns skip hashing the data itself
+        return _cached_aggregation(self.data_key, func.__name__, args, func, df)
+
+    def _figure(self, build, df: pd.DataFrame, *args):
+        """Build a finished figure, reusing the cached one for unchanged chart settings when the dataset has a key"""
+        if self.data_key is None:
+            return build(df, *args)
+        return _cached_figure(self.data_key, build.__name__, args, build, df)
+
+    def _plot_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Float32 view of the data for Plotly, built once per dataset when it has a key"""
+        if self.data_key is None:
+            return _downcast_for_viz(df)
+        return _cached_downcast_for_viz(self.data_key, df)
+
+    @property
+    def color_palette(self) -> List[str]:
+        """Qualitative palette for multi-series charts"""
+        import plotly.express as px
+        return px.colors.qualitative.Set3
 
     def create_bar_chart(self, df: pd.DataFrame, categorical_columns: List[str], numeric_columns: List[str]):
         """Create interactive bar chart"""
+        import plotly.graph_objects as go
 
         if not categorical_columns or not numeric_columns:
             st.warning("Bar chart requires both categorical and numeric columns.")
@@ -38,50 +261,48 @@ class ChartGenerator:
             )
 
             try:
-                if aggregation == "count":
-                    # Count occurrences
-                    chart_data = df.groupby(x_column).size().reset_index(name='count')
-                    y_col = 'count'
-                else:
-                    # Apply aggregation function
-                    chart_data = df.groupby(x_column)[y_column].agg(aggregation).reset_index()
-                    y_col = y_column
+                y_col = 'count' if aggregation == "count" else y_column
+                aggregated = self._aggregate(_bar_aggregation, df, x_column, y_column, aggregation)
+
+                # Only the largest bars are sent to the browser
+                top_values = aggregated.nlargest(BAR_CHART_MAX_CATEGORIES)
+                title = f"{aggregation.capitalize()} of {y_col} by {x_column}"
+                if len(aggregated) > BAR_CHART_MAX_CATEGORIES:
+                    title += f" (top {BAR_CHART_MAX_CATEGORIES} of {len(aggregated)})"
 
                 # Create bar chart
-                fig = px.bar(
-                    chart_data,
-                    x=x_column,
-                    y=y_col,
-                    title=f"{aggregation.capitalize()} of {y_col} by {x_column}",
-                    color=y_col,
-                    color_continuous_scale="viridis",
-                    height=self.default_height
-                )
+                fig = go.Figure(go.Bar(
+                    x=top_values.index.tolist(),
+                    y=top_values.to_numpy(),
+                    marker=dict(color=top_values.to_numpy(), colorscale="Viridis", showscale=True)
+                ))
 
                 fig.update_layout(
+                    title=title,
                     xaxis_title=x_column,
                     yaxis_title=f"{aggregation.capitalize()} of {y_col}",
+                    xaxis_type="category",
+                    height=self.default_height,
                     showlegend=False
                 )
 
                 st.plotly_chart(fig, use_container_width=True)
 
-                # Show summary statistics
+                # Show summary statistics (over all categories, not just the charted ones)
                 st.subheader("Summary Statistics")
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Total Categories", len(chart_data))
+                    st.metric("Total Categories", len(aggregated))
                 with col2:
-                    st.metric("Max Value", f"{chart_data[y_col].max():.2f}")
+                    st.metric("Max Value", f"{aggregated.max():.2f}")
                 with col3:
-                    st.metric("Min Value", f"{chart_data[y_col].min():.2f}")
+                    st.metric("Min Value", f"{aggregated.min():.2f}")
 
             except Exception as e:
                 st.error(f"Error creating bar chart: {str(e)}")
 
     def create_line_chart(self, df: pd.DataFrame, numeric_columns: List[str]):
         """Create interactive line chart"""
-
         if len(numeric_columns) < 2:
             st.warning("Line chart requires at least 2 numeric columns.")
             return
@@ -97,36 +318,45 @@ class ChartGenerator:
 
         if x_column and y_columns:
             try:
-                fig = go.Figure()
-
-                for i, y_col in enumerate(y_columns):
-                    # Sort data by x-axis for proper line connection
-                    sorted_data = df[[x_column, y_col]].dropna().sort_values(x_column)
-
-                    fig.add_trace(go.Scatter(
-                        x=sorted_data[x_column],
-                        y=sorted_data[y_col],
-                        mode='lines+markers',
-                        name=y_col,
-                        line=dict(color=self.color_palette[i % len(self.color_palette)])
-                    ))
-
-                fig.update_layout(
-                    title=f"Line Chart: {', '.join(y_columns)} vs {x_column}",
-                    xaxis_title=x_column,
-                    yaxis_title="Values",
-                    height=self.default_height,
-                    hovermode='x unified'
-                )
-
+                fig = self._figure(self._build_line_figure, df, x_column, tuple(y_columns))
                 st.plotly_chart(fig, use_container_width=True)
 
             except Exception as e:
                 st.error(f"Error creating line chart: {str(e)}")
 
+    def _build_line_figure(self, df: pd.DataFrame, x_column: str, y_columns: tuple):
+        """Line chart of every y column against x, one coloured series each"""
+        import plotly.express as px
+
+        # Sort by the x-axis once for proper line connection; Plotly bridges missing y values
+        base = self._plot_frame(df)[[x_column, *y_columns]].dropna(subset=[x_column]).sort_values(x_column)
+
+        # Long format: one px.line call draws every series, coloured from the palette.
+        # Dunder names cannot collide with user columns (e.g. one called "value")
+        long_data = base.melt(id_vars=x_column, var_name='__series__', value_name='__value__')
+        fig = px.line(
+            long_data,
+            x=x_column,
+            y='__value__',
+            color='__series__',
+            labels={'__series__': 'Series', '__value__': 'Value'},
+            color_discrete_sequence=self.color_palette,
+            markers=True
+        )
+        fig.update_traces(connectgaps=True)
+
+        fig.update_layout(
+            title=f"Line Chart: {', '.join(y_columns)} vs {x_column}",
+            xaxis_title=x_column,
+            yaxis_title="Values",
+            legend_title_text="",
+            height=self.default_height,
+            hovermode='x unified'
+        )
+        return fig
+
     def create_scatter_plot(self, df: pd.DataFrame, numeric_columns: List[str]):
         """Create interactive scatter plot"""
-
         if len(numeric_columns) < 2:
             st.warning("Scatter plot requires at least 2 numeric columns.")
             return
@@ -141,67 +371,96 @@ class ChartGenerator:
                                   key="scatter_y")
         with col3:
             # Option to color by a categorical column
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            _, categorical_cols, _ = self._aggregate(_classify_columns, df)
             color_column = st.selectbox("Color by (optional)", 
                                       ["None"] + categorical_cols, 
                                       key="scatter_color")
 
+        # Limit the points sent to the browser; statistics below still use every row
+        max_points = len(df)
+        if len(df) > SCATTER_MIN_POINTS:
+            max_points = st.slider(
+                "Max points to render",
+                min_value=SCATTER_MIN_POINTS,
+                max_value=200_000,
+                value=SCATTER_MAX_POINTS,
+                step=1_000,
+                key="scatter_max_points"
+            )
+
         if x_column and y_column:
             try:
-                # Create scatter plot
-                if color_column and color_column != "None":
-                    fig = px.scatter(
-                        df,
-                        x=x_column,
-                        y=y_column,
-                        color=color_column,
-                        title=f"Scatter Plot: {y_column} vs {x_column} (colored by {color_column})",
-                        height=self.default_height,
-                        opacity=0.7
-                    )
-                else:
-                    fig = px.scatter(
-                        df,
-                        x=x_column,
-                        y=y_column,
-                        title=f"Scatter Plot: {y_column} vs {x_column}",
-                        height=self.default_height,
-                        opacity=0.7
-                    )
-
                 # Add trendline option
                 add_trendline = st.checkbox("Add trendline", key="scatter_trend")
-                if add_trendline:
-                    # Calculate trendline
-                    clean_data = df[[x_column, y_column]].dropna()
-                    if len(clean_data) > 1:
-                        z = np.polyfit(clean_data[x_column], clean_data[y_column], 1)
-                        p = np.poly1d(z)
-
-                        fig.add_trace(go.Scatter(
-                            x=clean_data[x_column],
-                            y=p(clean_data[x_column]),
-                            mode='lines',
-                            name='Trendline',
-                            line=dict(color='red', dash='dash')
-                        ))
-
-                fig.update_layout(
-                    xaxis_title=x_column,
-                    yaxis_title=y_column
+                color = color_column if color_column and color_column != "None" else None
+                fig = self._figure(
+                    self._build_scatter_figure, df, x_column, y_column, color, max_points, add_trendline
                 )
 
                 st.plotly_chart(fig, use_container_width=True)
 
-                # Calculate and display correlation
-                correlation = df[x_column].corr(df[y_column])
+                # Calculate and display correlation over every row where both values are present
+                correlation = _pearson(*_paired_values(df, x_column, y_column))
                 st.metric("Correlation Coefficient", f"{correlation:.3f}")
 
             except Exception as e:
                 st.error(f"Error creating scatter plot: {str(e)}")
 
+    def _build_scatter_figure(self, df: pd.DataFrame, x_column: str, y_column: str,
+                              color_column: Optional[str], max_points: int, add_trendline: bool):
+        """Scatter plot of at most max_points sampled rows, with an optional trendline fitted on every row"""
+        import plotly.express as px
+        import plotly.graph_objects as go
+
+        plot_df = self._plot_frame(df)
+        sampled = len(plot_df) > max_points
+        if sampled:
+            plot_df = plot_df.sample(n=max_points, random_state=0)
+        render_mode = "webgl" if len(plot_df) > WEBGL_MIN_POINTS else "svg"
+
+        title = f"Scatter Plot: {y_column} vs {x_column}"
+        if color_column is not None:
+            title += f" (colored by {color_column})"
+        if sampled:
+            title += f" ({max_points:,} of {len(df):,} points)"
+
+        fig = px.scatter(
+            plot_df,
+            x=x_column,
+            y=y_column,
+            color=color_column,
+            title=title,
+            height=self.default_height,
+            opacity=0.7,
+            render_mode=render_mode
+        )
+
+        if add_trendline:
+            # Calculate trendline over the full-precision rows where both values are present
+            x, y = _paired_values(df, x_column, y_column)
+            line = _fit_line(x, y)
+            if line is not None:
+                slope, intercept = line
+                # A straight line only needs its two end points
+                x_ends = np.array([x.min(), x.max()])
+
+                fig.add_trace(go.Scatter(
+                    x=x_ends,
+                    y=slope * x_ends + intercept,
+                    mode='lines',
+                    name='Trendline',
+                    line=dict(color='red', dash='dash')
+                ))
+
+        fig.update_layout(
+            xaxis_title=x_column,
+            yaxis_title=y_column
+        )
+        return fig
+
     def create_histogram(self, df: pd.DataFrame, numeric_columns: List[str]):
         """Create interactive histogram"""
+        import plotly.graph_objects as go
 
         if not numeric_columns:
             st.warning("Histogram requires numeric columns.")
@@ -216,16 +475,22 @@ class ChartGenerator:
 
         if selected_column:
             try:
-                fig = px.histogram(
-                    df,
-                    x=selected_column,
-                    nbins=bins,
-                    title=f"Distribution of {selected_column}",
-                    height=self.default_height,
+                data = df[selected_column].to_numpy(dtype=np.float64, na_value=np.nan)
+                data = data[~np.isnan(data)]
+
+                # Bin on the server so only the bin counts are sent to the browser, not every row
+                counts, edges = np.histogram(data[np.isfinite(data)], bins=bins)
+                fig = go.Figure(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=counts,
+                    customdata=np.column_stack([edges[:-1], edges[1:]]),
+                    hovertemplate="%{customdata[0]:.4g} to %{customdata[1]:.4g}<br>Count: %{y}<extra></extra>",
                     opacity=0.7
-                )
+                ))
 
                 fig.update_layout(
+                    title=f"Distribution of {selected_column}",
+                    height=self.default_height,
                     xaxis_title=selected_column,
                     yaxis_title="Frequency",
                     bargap=0.1
@@ -233,16 +498,21 @@ class ChartGenerator:
 
                 st.plotly_chart(fig, use_container_width=True)
 
-                # Display statistics
+                # Display statistics (sample std, as pandas reports it)
+                if len(data) > 0:
+                    mean, median = data.mean(), np.median(data)
+                    std = data.std(ddof=1) if len(data) > 1 else np.nan
+                else:
+                    mean = median = std = np.nan
+
                 col1, col2, col3, col4 = st.columns(4)
-                data = df[selected_column].dropna()
 
                 with col1:
-                    st.metric("Mean", f"{data.mean():.3f}")
+                    st.metric("Mean", f"{mean:.3f}")
                 with col2:
-                    st.metric("Median", f"{data.median():.3f}")
+                    st.metric("Median", f"{median:.3f}")
                 with col3:
-                    st.metric("Std Dev", f"{data.std():.3f}")
+                    st.metric("Std Dev", f"{std:.3f}")
                 with col4:
                     st.metric("Count", len(data))
 
@@ -251,7 +521,6 @@ class ChartGenerator:
 
     def create_box_plot(self, df: pd.DataFrame, categorical_columns: List[str], numeric_columns: List[str]):
         """Create interactive box plot"""
-
         if not categorical_columns or not numeric_columns:
             st.warning("Box plot requires both categorical and numeric columns.")
             return
@@ -265,31 +534,39 @@ class ChartGenerator:
 
         if x_column and y_column:
             try:
-                fig = px.box(
-                    df,
-                    x=x_column,
-                    y=y_column,
-                    title=f"Box Plot: {y_column} by {x_column}",
-                    height=self.default_height
-                )
-
-                fig.update_layout(
-                    xaxis_title=x_column,
-                    yaxis_title=y_column
-                )
+                fig = self._figure(self._build_box_figure, df, x_column, y_column)
 
                 st.plotly_chart(fig, use_container_width=True)
 
                 # Show statistics by category
-                stats_by_category = df.groupby(x_column)[y_column].agg(['mean', 'median', 'std', 'count']).round(3)
+                stats_by_category = self._aggregate(_box_statistics, df, x_column, y_column)
                 st.subheader(f"Statistics of {y_column} by {x_column}")
                 st.dataframe(stats_by_category, use_container_width=True)
 
             except Exception as e:
                 st.error(f"Error creating box plot: {str(e)}")
 
+    def _build_box_figure(self, df: pd.DataFrame, x_column: str, y_column: str):
+        """Box plot of y_column per x_column category"""
+        import plotly.express as px
+
+        fig = px.box(
+            self._plot_frame(df),
+            x=x_column,
+            y=y_column,
+            title=f"Box Plot: {y_column} by {x_column}",
+            height=self.default_height
+        )
+
+        fig.update_layout(
+            xaxis_title=x_column,
+            yaxis_title=y_column
+        )
+        return fig
+
     def create_heatmap(self, df: pd.DataFrame, numeric_columns: List[str]):
         """Create correlation heatmap"""
+        import plotly.express as px
 
         if len(numeric_columns) < 2:
             st.warning("Heatmap requires at least 2 numeric columns.")
@@ -308,19 +585,25 @@ class ChartGenerator:
             return
 
         try:
-            # Calculate correlation matrix
-            correlation_matrix = df[selected_columns].corr()
+            # Correlate every numeric column once, then slice: toggling columns reuses the cached matrix
+            # (pairwise-complete correlation, so a slice equals the matrix of the selected columns)
+            full_matrix = self._aggregate(_correlation, df, tuple(numeric_columns))
+            correlation_matrix = full_matrix.loc[selected_columns, selected_columns]
 
             # Create heatmap
+            # One text label per cell is quadratic in the column count; wide heatmaps show values on hover
+            annotate = len(selected_columns) <= HEATMAP_MAX_ANNOTATED_COLUMNS
             fig = px.imshow(
                 correlation_matrix,
-                text_auto=True,
+                text_auto='.2f' if annotate else False,
                 aspect="auto",
                 color_continuous_scale='RdBu_r',
                 title="Correlation Heatmap",
                 height=max(400, len(selected_columns) * 40)
             )
 
+            fig.update_traces(hovertemplate="%{x} vs %{y}: %{z:.3f}<extra></extra>")
+
             fig.update_layout(
                 xaxis_title="Variables",
                 yaxis_title="Variables"
@@ -330,20 +613,16 @@ class ChartGenerator:
 
             # Find and display strong correlations
             st.subheader("Strong Correlations (|r| > 0.5)")
-            strong_correlations = []
-
-            for i in range(len(correlation_matrix.columns)):
-                for j in range(i+1, len(correlation_matrix.columns)):
-                    corr_val = correlation_matrix.iloc[i, j]
-                    if abs(corr_val) > 0.5:
-                        strong_correlations.append({
-                            'Variable 1': correlation_matrix.columns[i],
-                            'Variable 2': correlation_matrix.columns[j],
-                            'Correlation': f"{corr_val:.3f}"
-                        })
-
-            if strong_correlations:
-                strong_corr_df = pd.DataFrame(strong_correlations)
+            # Each pair once from the upper triangle (Numba kernel when available)
+            rows, cols, pair_values = strong_pairs(correlation_matrix.to_numpy(), 0.5)
+            names = correlation_matrix.columns.to_numpy()
+
+            if len(pair_values) > 0:
+                strong_corr_df = pd.DataFrame({
+                    'Variable 1': names[rows],
+                    'Variable 2': names[cols],
+                    'Correlation': np.round(pair_values, 3)
+                })
                 st.dataframe(strong_corr_df, use_container_width=True)
             else:
                 st.info("No strong correlations found (|r| > 0.5)")
@@ -353,6 +632,7 @@ class ChartGenerator:
 
     def create_pie_chart(self, df: pd.DataFrame, categorical_columns: List[str]):
         """Create interactive pie chart"""
+        import plotly.express as px
 
         if not categorical_columns:
             st.warning("Pie chart requires categorical columns.")
@@ -363,7 +643,7 @@ class ChartGenerator:
         if selected_column:
             try:
                 # Get value counts
-                value_counts = df[selected_column].value_counts()
+                value_counts = self._aggregate(_value_counts, df, selected_column)
 
                 # Option to show only top N categories
                 max_categories = st.slider("Maximum categories to show", 
@@ -372,15 +652,16 @@ class ChartGenerator:
                                          value=min(10, len(value_counts)),
                                          key="pie_max")
 
-                # Take top N categories and group others as 'Others'
+                # Take top N categories and group others as 'Others' (partial sort via nlargest)
+                total = int(value_counts.sum())
                 if len(value_counts) > max_categories:
-                    top_categories = value_counts.head(max_categories-1)
-                    others_count = value_counts.tail(len(value_counts) - max_categories + 1).sum()
+                    top_categories = value_counts.nlargest(max_categories - 1)
+                    others_count = total - top_categories.sum()
 
                     # Create new series with 'Others' category
                     display_data = pd.concat([top_categories, pd.Series([others_count], index=['Others'])])
                 else:
-                    display_data = value_counts
+                    display_data = value_counts.nlargest(len(value_counts))
 
                 fig = px.pie(
                     values=display_data.values,
@@ -399,11 +680,9 @@ class ChartGenerator:
 
                 # Show data table
                 st.subheader("Category Counts")
-                counts_df = pd.DataFrame({
-                    'Category': display_data.index,
-                    'Count': display_data.values,
-                    'Percentage': (display_data.values / display_data.sum() * 100).round(2)
-                })
+                counts_df = display_data.to_frame('Count').rename_axis('Category').reset_index()
+                # The displayed counts always add up to the total computed above
+                counts_df['Percentage'] = (counts_df['Count'].to_numpy() * (100.0 / total)).round(2)
                 st.dataframe(counts_df, use_container_width=True)
 
             except Exception as e:
@@ -411,6 +690,7 @@ class ChartGenerator:
 
     def create_custom_chart(self, df: pd.DataFrame):
         """Allow users to create custom charts with more control"""
+        import plotly.express as px
 
         st.subheader("🎨 Custom Chart Builder")
 
@@ -424,9 +704,9 @@ class ChartGenerator:
             )
 
         with col2:
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-            all_cols = df.columns.tolist()
+            # Dtype scan runs once per dataset; every chart-type branch reuses the lists
+            numeric_cols, categorical_cols, all_cols = self._aggregate(_classify_columns, df)
+        plot_df = self._plot_frame(df)
 
         # Dynamic column selection based on chart type
         if chart_type in ["Scatter", "Line"]:
@@ -438,9 +718,9 @@ class ChartGenerator:
                 color_param = color_col if color_col != "None" else None
 
                 if chart_type == "Scatter":
-                    fig = px.scatter(df, x=x_col, y=y_col, color=color_param)
+                    fig = px.scatter(plot_df, x=x_col, y=y_col, color=color_param)
                 else:  # Line
-                    fig = px.line(df, x=x_col, y=y_col, color=color_param)
+                    fig = px.line(plot_df, x=x_col, y=y_col, color=color_param)
 
                 st.plotly_chart(fig, use_container_width=True)
 
@@ -449,7 +729,7 @@ class ChartGenerator:
             y_col = st.selectbox("Y-axis", numeric_cols, key="custom_bar_y")
 
             if x_col and y_col:
-                fig = px.bar(df, x=x_col, y=y_col)
+                fig = px.bar(plot_df, x=x_col, y=y_col)
                 st.plotly_chart(fig, use_container_width=True)
 
         elif chart_type in ["Box", "Violin"]:
@@ -458,8 +738,8 @@ class ChartGenerator:
 
             if x_col and y_col:
                 if chart_type == "Box":
-                    fig = px.box(df, x=x_col, y=y_col)
+                    fig = px.box(plot_df, x=x_col, y=y_col)
                 else:  # Violin
-                    fig = px.violin(df, x=x_col, y=y_col, box=True)
+                    fig = px.violin(plot_df, x=x_col, y=y_col, box=True)
 
                 st.plotly_chart(fig, use_container_width=True)